@@ -0,0 +1,3 @@
+""" Benchmarks of sat-stac on synthetic catalogs, run with `python -m benchmarks` """
+from .generate import catalog, collection, items, itemcollection
+from .run import SCENARIOS, compare, measure, run, summary
@@ -0,0 +1,55 @@
+import argparse
+import json
+import logging
+import sys
+
+from .run import SCENARIOS, compare, run, summary
+
+
+def parse_args(args):
+    dhf = argparse.ArgumentDefaultsHelpFormatter
+    parser0 = argparse.ArgumentParser(description='sat-stac benchmarks')
+    subparsers = parser0.add_subparsers(dest='command')
+
+    parser = subparsers.add_parser('run', help='Run benchmarks on a synthetic catalog', formatter_class=dhf)
+    parser.add_argument('--items', help='Number of Items', type=int, default=1000)
+    parser.add_argument('--depth', help='Levels of sub-catalogs', type=int, default=2)
+    parser.add_argument('--fanout', help='Children of each sub-catalog', type=int, default=3)
+    parser.add_argument('--seed', help='Seed of the synthetic catalog', type=int, default=0)
+    parser.add_argument('--path', default=None,
+                        help='Directory or memory:// URL to write to, "local" for a temporary directory (default in memory)')
+    parser.add_argument('--workers', help='Threads used by concurrent scenarios', type=int, default=8)
+    parser.add_argument('--repeat', help='Runs of each scenario, the fastest is reported', type=int, default=3)
+    parser.add_argument('--scenario', help='Scenarios to run (default all)', nargs='*', choices=list(SCENARIOS.keys()))
+    parser.add_argument('--output', help='Save results as JSON to this file', default=None)
+    parser.add_argument('--log', default=3, type=int,
+                        help='0:all, 1:debug, 2:info, 3:warning, 4:error, 5:critical')
+
+    parser = subparsers.add_parser('compare', help='Compare saved results', formatter_class=dhf)
+    parser.add_argument('old', help='Results JSON file of the baseline')
+    parser.add_argument('new', help='Results JSON file to compare')
+
+    return vars(parser0.parse_args(args))
+
+
+def main(args):
+    args = parse_args(args)
+    cmd = args.pop('command')
+    if cmd == 'run':
+        logging.basicConfig(level=args['log'] * 10)
+        results = run(nitems=args['items'], depth=args['depth'], fanout=args['fanout'], seed=args['seed'],
+                      path=args['path'], workers=args['workers'], repeat=args['repeat'], scenarios=args['scenario'])
+        print(summary(results))
+        if args['output'] is not None:
+            with open(args['output'], 'w') as f:
+                f.write(json.dumps(results, indent=2))
+    elif cmd == 'compare':
+        with open(args['old']) as f:
+            old = json.loads(f.read())
+        with open(args['new']) as f:
+            new = json.loads(f.read())
+        print(compare(old, new))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
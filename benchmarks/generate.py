@@ -0,0 +1,100 @@
+import datetime
+import logging
+import random
+
+from satstac import Catalog, Collection, Item, ItemCollection
+from satstac.catalog import STAC_VERSION
+
+logger = logging.getLogger(__name__)
+
+PLATFORMS = ['landsat-8', 'sentinel-2a', 'sentinel-2b']
+
+BANDS = [
+    ('B1', 'coastal'), ('B2', 'blue'), ('B3', 'green'), ('B4', 'red'),
+    ('B5', 'nir'), ('B6', 'swir16'), ('B7', 'swir22'),
+]
+
+
+def collection(id='synthetic'):
+    """ Get a synthetic Collection with asset definitions for every band """
+    return Collection({
+        'id': id,
+        'stac_version': STAC_VERSION,
+        'description': 'Synthetic collection for benchmarks',
+        'license': 'proprietary',
+        'extent': {
+            'spatial': {'bbox': [[-180, -90, 180, 90]]},
+            'temporal': {'interval': [['2020-01-01T00:00:00Z', None]]}
+        },
+        'item_assets': {
+            key: {'title': 'Band %s (%s)' % (key, name), 'type': 'image/tiff; application=geotiff',
+                  'eo:bands': [{'name': key, 'common_name': name}]}
+            for key, name in BANDS
+        },
+        'links': []
+    })
+
+
+def item_data(i, rnd, collection='synthetic', fanout=3, depth=2, start=datetime.datetime(2020, 1, 1)):
+    """ Get dictionary of synthetic Item number i, drawing values from the random generator rnd """
+    lon, lat = rnd.uniform(-180, 179), rnd.uniform(-80, 79)
+    dt = start + datetime.timedelta(seconds=rnd.randint(0, 365 * 86400 - 1))
+    id = '%s-%08d' % (collection, i)
+    properties = {
+        'datetime': dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+        'platform': rnd.choice(PLATFORMS),
+        'eo:cloud_cover': round(rnd.uniform(0, 100), 2),
+        'view:sun_elevation': round(rnd.uniform(0, 90), 4),
+        'view:sun_azimuth': round(rnd.uniform(0, 360), 4),
+    }
+    # properties placing the Item in the sub-catalog tree, see FILENAME_TEMPLATE
+    for level in range(depth):
+        properties['bench:level%s' % level] = 'c%s' % rnd.randrange(fanout)
+    return {
+        'type': 'Feature',
+        'stac_version': STAC_VERSION,
+        'id': id,
+        'collection': collection,
+        'bbox': [lon, lat, lon + 1, lat + 1],
+        'geometry': {
+            'type': 'Polygon',
+            'coordinates': [[[lon, lat], [lon + 1, lat], [lon + 1, lat + 1], [lon, lat + 1], [lon, lat]]]
+        },
+        'properties': properties,
+        'assets': {
+            key: {'href': 'https://example.com/%s/%s_%s.TIF' % (id, id, key), 'type': 'image/tiff; application=geotiff'}
+            for key, name in BANDS
+        },
+        'links': []
+    }
+
+
+def items(nitems, seed=0, fanout=3, depth=2, collection='synthetic'):
+    """ Get list of nitems synthetic Items, the same for the same seed """
+    rnd = random.Random(seed)
+    return [Item(item_data(i, rnd, collection=collection, fanout=fanout, depth=depth)) for i in range(nitems)]
+
+
+def itemcollection(nitems, seed=0, fanout=3, depth=2):
+    """ Get ItemCollection of nitems synthetic Items and their Collection """
+    return ItemCollection(items(nitems, seed=seed, fanout=fanout, depth=depth), collections=[collection()])
+
+
+def filename_template(depth):
+    """ Get template nesting Items depth sub-catalogs deep """
+    return '/'.join(['${bench:level%s}' % level for level in range(depth)] + ['${id}.json'])
+
+
+def catalog(path, nitems, depth=2, fanout=3, seed=0):
+    """ Create a catalog of nitems synthetic Items under path (a directory or memory:// URL)
+
+    Items are in a single Collection, within sub-catalogs `depth` levels deep with `fanout`
+    children each. Returns the root Catalog.
+    """
+    cat = Catalog.create(id='synthetic-catalog').save(path.rstrip('/') + '/catalog.json')
+    col = collection()
+    cat.add_catalog(col)
+    stats = col.add_items(items(nitems, seed=seed, fanout=fanout, depth=depth),
+                          filename_template=filename_template(depth))
+    logger.info('Generated catalog of %s items at %.0f items/sec' % (nitems, stats['items_per_second'] or 0))
+    return cat
@@ -0,0 +1,229 @@
+import datetime
+import gc
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from collections import OrderedDict
+
+from satstac import cache, storage, Catalog, Item, ItemCollection
+from satstac.cache import copy_json
+from satstac.version import __version__
+
+from . import generate
+
+logger = logging.getLogger(__name__)
+
+# name: function(context) returning number of operations, in order of running
+SCENARIOS = OrderedDict()
+
+
+def scenario(name):
+    """ Register a benchmark scenario """
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def _path(ctx, name):
+    """ Get a new location under the benchmark path for scenario name """
+    ctx['runs'] += 1
+    return '%s/%s-%s' % (ctx['path'].rstrip('/'), name, ctx['runs'])
+
+
+@scenario('collection.add_item')
+def add_item(ctx):
+    cat = Catalog.create().save(_path(ctx, 'add_item') + '/catalog.json')
+    col = generate.collection()
+    cat.add_catalog(col)
+    template = generate.filename_template(ctx['depth'])
+    for item in ctx['items']:
+        col.add_item(Item(copy_json(item._data)), filename_template=template)
+    return len(ctx['items'])
+
+
+@scenario('collection.add_items')
+def add_items(ctx):
+    cat = generate.catalog(_path(ctx, 'add_items'), len(ctx['items']), depth=ctx['depth'],
+                           fanout=ctx['fanout'], seed=ctx['seed'])
+    ctx['catalog'] = cat.filename
+    return len(ctx['items'])
+
+
+@scenario('thing.open')
+def thing_open(ctx):
+    for fname in ctx['filenames']:
+        cache.documents.invalidate(fname)
+        Item.open(fname)
+    return len(ctx['filenames'])
+
+
+@scenario('thing.open (cached)')
+def thing_open_cached(ctx):
+    for fname in ctx['filenames']:
+        Item.open(fname)
+    return len(ctx['filenames'])
+
+
+@scenario('catalog.items')
+def catalog_items(ctx):
+    cache.documents.invalidate()
+    return len(list(Catalog.open(ctx['catalog']).items()))
+
+
+@scenario('catalog.items (workers)')
+def catalog_items_workers(ctx):
+    cache.documents.invalidate()
+    return len(list(Catalog.open(ctx['catalog']).items(workers=ctx['workers'])))
+
+
+@scenario('itemcollection.save')
+def itemcollection_save(ctx):
+    ctx['itemcollection'] = _path(ctx, 'itemcollection') + '.json'
+    ItemCollection(ctx['items'], collections=[generate.collection()]).save(ctx['itemcollection'])
+    return len(ctx['items'])
+
+
+@scenario('itemcollection.open')
+def itemcollection_open(ctx):
+    return len(ItemCollection.open(ctx['itemcollection']))
+
+
+@scenario('itemcollection.stream')
+def itemcollection_stream(ctx):
+    return sum(1 for i in ItemCollection.stream(ctx['itemcollection']))
+
+
+@scenario('itemcollection.filter')
+def itemcollection_filter(ctx):
+    items = ItemCollection(list(ctx['items']))
+    items.filter('platform', generate.PLATFORMS[0:1])
+    return len(ctx['items'])
+
+
+@scenario('item.create')
+def item_create(ctx):
+    # Item data is shared, so peak memory is the per-Item overhead
+    items = ItemCollection([Item(item._data) for item in ctx['items']])
+    return len(items)
+
+
+@scenario('item.get_path')
+def item_get_path(ctx):
+    template = generate.filename_template(ctx['depth']).replace('${id}', '${date}/${id}')
+    for item in ctx['items']:
+        item.get_path(template)
+    return len(ctx['items'])
+
+
+def measure(func, ctx, repeat=3):
+    """ Time func(ctx) repeat times and trace its peak memory use in one more run
+
+    Returns dictionary of count (operations per run), seconds (fastest run), per_second
+    and peak_memory (bytes allocated at the peak)
+    """
+    times = []
+    for i in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        count = func(ctx)
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(ctx)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    seconds = min(times)
+    return {
+        'count': count,
+        'seconds': seconds,
+        'per_second': count / seconds if seconds > 0 else None,
+        'peak_memory': peak,
+    }
+
+
+def run(nitems=1000, depth=2, fanout=3, seed=0, path=None, workers=8, repeat=3, scenarios=None):
+    """ Run benchmark scenarios (default all) on a synthetic catalog of nitems Items
+
+    Files are written under path, a local directory or memory:// URL (by default in memory).
+    Returns a dictionary of environment, parameters and results by scenario, that can be
+    saved as JSON and compared with compare()
+    """
+    params = OrderedDict([('nitems', nitems), ('depth', depth), ('fanout', fanout), ('seed', seed),
+                          ('path', path or 'memory://satstac-benchmark'), ('workers', workers), ('repeat', repeat)])
+    tmpdir = tempfile.mkdtemp(prefix='satstac-benchmark-')
+    if path == 'local':
+        params['path'] = tmpdir
+    ctx = dict(params, runs=0)
+    ctx['items'] = generate.items(nitems, seed=seed, fanout=fanout, depth=depth)
+    # catalog and item files used by the read scenarios
+    cat = generate.catalog(_path(ctx, 'catalog'), nitems, depth=depth, fanout=fanout, seed=seed)
+    ctx['catalog'] = cat.filename
+    # thing.open reads local files, where a cache hit saves reading (not only parsing) the file,
+    # and no more than fit in the cache
+    ctx['filenames'] = []
+    for item in Catalog.open(cat.filename).items():
+        if len(ctx['filenames']) >= max(cache.documents.maxsize, 1):
+            break
+        fname = item.filename
+        if storage.scheme(fname) != '':
+            fname = os.path.join(tmpdir, 'items', '%s.json' % item.id)
+            storage.get(fname).write(fname, storage.get(item.filename).read(item.filename))
+        ctx['filenames'].append(os.path.abspath(fname))
+    ctx['itemcollection'] = _path(ctx, 'itemcollection') + '.json'
+    ItemCollection(ctx['items'], collections=[generate.collection()]).save(ctx['itemcollection'])
+
+    results = OrderedDict()
+    try:
+        for name, func in SCENARIOS.items():
+            if scenarios is not None and name not in scenarios:
+                continue
+            results[name] = measure(func, ctx, repeat=repeat)
+            logger.info('%s: %s' % (name, results[name]))
+    finally:
+        shutil.rmtree(tmpdir)
+        if params['path'].startswith('memory://'):
+            store = storage.get(params['path'])
+            for url in store.list(params['path']):
+                store.remove(url)
+    return OrderedDict([
+        ('satstac_version', __version__),
+        ('python', sys.version.split()[0]),
+        ('platform', platform.platform()),
+        ('timestamp', datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')),
+        ('params', params),
+        ('results', results),
+    ])
+
+
+def summary(results):
+    """ Get text table of run() results """
+    lines = ['{:<28} {:>10} {:>12} {:>12} {:>14}'.format('Scenario', 'Count', 'Seconds', 'Per second', 'Peak memory')]
+    for name, r in results['results'].items():
+        lines.append('{:<28} {:>10} {:>12.4f} {:>12.0f} {:>14}'.format(
+            name, r['count'], r['seconds'], r['per_second'] or 0, r['peak_memory']))
+    return '\n'.join(lines)
+
+
+def compare(old, new):
+    """ Get text table comparing two run() results, ratios below 1 are improvements """
+    lines = ['{:<28} {:>12} {:>12} {:>8} {:>14} {:>14} {:>8}'.format(
+        'Scenario', 'Old seconds', 'New seconds', 'Ratio', 'Old memory', 'New memory', 'Ratio')]
+    for name, r in new['results'].items():
+        if name not in old['results']:
+            continue
+        o = old['results'][name]
+        # normalize by count in case runs used different sizes
+        t0, t1 = o['seconds'] / o['count'] * r['count'], r['seconds']
+        lines.append('{:<28} {:>12.4f} {:>12.4f} {:>8.2f} {:>14} {:>14} {:>8.2f}'.format(
+            name, t0, t1, t1 / t0 if t0 > 0 else float('nan'),
+            o['peak_memory'], r['peak_memory'], r['peak_memory'] / o['peak_memory'] if o['peak_memory'] else float('nan')))
+    return '\n'.join(lines)
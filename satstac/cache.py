@@ -0,0 +1,114 @@
+import logging
+import os
+import threading
+
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def copy_json(data):
+    """ Copy a parsed JSON document (faster than copy.deepcopy for plain dicts and lists) """
+    if isinstance(data, dict):
+        return {k: copy_json(v) for k, v in data.items()}
+    elif isinstance(data, list):
+        return [copy_json(v) for v in data]
+    return data
+
+
+class DocumentCache(object):
+    """ Size-bounded LRU cache of JSON documents
+
+    Entries are keyed by the absolute filename or URL of a document and stored along
+    with a validator: (mtime, size) for local files and (ETag, Last-Modified) for
+    remote files. A cached document is only used while its validator is current.
+
+    Documents are stored as uncompressed JSON bytes, which callers parse into a new
+    object on every hit (parsing is faster than copying a parsed document in Python).
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._docs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, key):
+        return key in self._docs
+
+    def validator(self, key):
+        """ Get the validator stored for key (None if not cached) """
+        with self._lock:
+            entry = self._docs.get(key)
+        return entry[0] if entry is not None else None
+
+    def get(self, key, validator):
+        """ Get the cached document bytes if they match validator, otherwise None """
+        with self._lock:
+            entry = self._docs.get(key)
+            if entry is None or validator is None or entry[0] != validator:
+                self.misses += 1
+                return None
+            self._docs.move_to_end(key)
+            self.hits += 1
+        return entry[1]
+
+    def put(self, key, validator, data):
+        """ Store document bytes under key """
+        if self.maxsize <= 0 or validator is None:
+            return
+        with self._lock:
+            self._docs[key] = (validator, data)
+            self._docs.move_to_end(key)
+            while len(self._docs) > self.maxsize:
+                self._docs.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """ Remove key from the cache, or everything if no key given """
+        with self._lock:
+            if key is None:
+                self._docs.clear()
+            else:
+                self._docs.pop(key, None)
+
+    def resize(self, maxsize):
+        """ Change the maximum number of documents, evicting the oldest if needed """
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._docs) > max(maxsize, 0):
+                self._docs.popitem(last=False)
+
+    def stats(self):
+        """ Get hit/miss counters and current size """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._docs),
+            'maxsize': self.maxsize
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+
+def file_validator(stat):
+    """ Validator for a local file from its os.stat result """
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def http_validator(headers):
+    """ Validator for a remote file from response headers (None if it cannot be validated) """
+    etag = headers.get('ETag')
+    modified = headers.get('Last-Modified')
+    if etag is None and modified is None:
+        return None
+    return (etag, modified)
+
+
+# shared cache used by Thing.open, set SATSTAC_CACHE_SIZE=0 to disable
+documents = DocumentCache(maxsize=int(os.getenv('SATSTAC_CACHE_SIZE', 1024)))
@@ -1,14 +1,21 @@
 import json
 import os
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from . import transaction
 from .version import __version__
 from .thing import Thing, STACError
+from .utils import threaded_map
 
 STAC_VERSION = os.getenv('STAC_VERSION', '1.0.0-beta.2')
 
 
 class Catalog(Thing):
 
+    __slots__ = ()
+
     def __init__(self, data, root=None, **kwargs):
         """ Initialize a catalog with a catalog file """
         super(Catalog, self).__init__(data, **kwargs)
@@ -36,11 +43,22 @@ class Catalog(Thing):
         })
         return cls(kwargs, root=root)
 
-    def children(self):
-        """ Get child links """
+    def children(self, workers=None, ordered=True):
+        """ Get child links, opening up to `workers` of them concurrently if provided """
         # TODO = should this be tested if Collection and return mix of Catalogs and Collections?
-        for l in self.links('child'):
-            yield Catalog.open(l)
+        links = self.links('child')
+        if not workers:
+            for l in links:
+                yield Catalog.open(l)
+            return
+        with self._executor(workers) as executor:
+            yield from threaded_map(Catalog.open, links, executor, ordered=ordered)
+
+    @staticmethod
+    def _executor(workers):
+        """ Thread pool for opening links, sharing the Transaction (if any) of this thread """
+        return ThreadPoolExecutor(max_workers=workers, initializer=transaction.join,
+                                  initargs=(transaction.active(),))
 
     def catalogs(self):
         """ Recursive get all catalogs within this Catalog """
@@ -59,12 +77,51 @@ class Catalog(Thing):
             else:
                 yield from cat.collections()
 
-    def items(self):
-        """ Recursively get all items within this Catalog """
-        for item in self.links('item'):
-            yield Item.open(item)
-        for child in self.children():
-            yield from child.items()
+    def items(self, workers=None, ordered=True):
+        """ Recursively get all items within this Catalog
+
+        If `workers` is provided item and child links are fetched concurrently on a
+        pool of that many threads. With `ordered` (the default) Items are yielded in
+        the same order as a serial walk, otherwise as soon as they have been opened.
+        """
+        if not workers:
+            for item in self.links('item'):
+                yield Item.open(item)
+            for child in self.children():
+                yield from child.items()
+            return
+        with self._executor(workers) as executor:
+            if ordered:
+                yield from self._items_ordered(executor)
+            else:
+                yield from self._items_unordered(executor, window=2 * workers)
+
+    def _items_ordered(self, executor):
+        """ Walk items depth first, prefetching links of this catalog on executor """
+        yield from threaded_map(Item.open, self.links('item'), executor)
+        for child in threaded_map(Catalog.open, self.links('child'), executor):
+            yield from child._items_ordered(executor)
+
+    def _items_unordered(self, executor, window):
+        """ Walk items across the whole tree, yielding each as soon as it is opened """
+        links = deque([(Item, l) for l in self.links('item')] + [(Catalog, l) for l in self.links('child')])
+        pending = set()
+        try:
+            while links or pending:
+                while links and len(pending) < window:
+                    cls, link = links.popleft()
+                    pending.add(executor.submit(cls.open, link))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    thing = f.result()
+                    if isinstance(thing, Item):
+                        yield thing
+                    else:
+                        links.extend([(Item, l) for l in thing.links('item')])
+                        links.extend([(Catalog, l) for l in thing.links('child')])
+        finally:
+            for f in pending:
+                f.cancel()
 
     def add_catalog(self, catalog, basename='catalog'):
         """ Add a catalog to this catalog """
@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import time
+
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def _json():
+    return json.loads, lambda obj: json.dumps(obj).encode('utf-8')
+
+
+def _orjson():
+    import orjson
+    return orjson.loads, orjson.dumps
+
+
+def _ujson():
+    import ujson
+    return ujson.loads, lambda obj: ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+
+
+# name: function returning (loads, dumps), in order of preference
+CODECS = OrderedDict([
+    ('orjson', _orjson),
+    ('ujson', _ujson),
+    ('json', _json),
+])
+
+# (name, loads, dumps) of the codec in use, chosen on first use
+_codec = None
+
+
+def available():
+    """ Get names of codecs that are installed, in order of preference """
+    names = []
+    for name, codec in CODECS.items():
+        try:
+            codec()
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def use(name=None):
+    """ Use codec name for all JSON parsing and serialization, returning its name
+
+    If name is None the SATSTAC_JSON_CODEC environment variable is used, otherwise the
+    fastest installed codec (orjson, ujson, then the standard library json).
+    """
+    global _codec
+    name = name or os.getenv('SATSTAC_JSON_CODEC')
+    if name is None:
+        name = available()[0]
+    if name not in CODECS:
+        raise ValueError('Unknown JSON codec %s, use one of %s' % (name, ', '.join(CODECS.keys())))
+    loads, dumps = CODECS[name]()
+    _codec = (name, loads, dumps)
+    logger.debug('Using %s JSON codec' % name)
+    return name
+
+
+def name():
+    """ Get name of the codec in use """
+    return (_codec or (use(),))[0]
+
+
+def loads(data):
+    """ Parse JSON from bytes or str """
+    if _codec is None:
+        use()
+    return _codec[1](data)
+
+
+def dumps(obj):
+    """ Serialize obj as compact UTF-8 JSON bytes """
+    if _codec is None:
+        use()
+    return _codec[2](obj)
+
+
+def benchmark(docs, number=10, codecs=None):
+    """ Measure parse and serialize throughput of codecs (default all installed) on a list of documents
+
+    Returns dictionary of codec name: {'bytes', 'loads_seconds', 'dumps_seconds',
+    'loads_mb_per_second', 'dumps_mb_per_second'}, where bytes is the total size of the
+    documents serialized by that codec over `number` repetitions
+    """
+    results = OrderedDict()
+    for name in codecs or available():
+        _loads, _dumps = CODECS[name]()
+        encoded = [_dumps(d) for d in docs]
+        nbytes = sum(len(e) for e in encoded) * number
+        start = time.perf_counter()
+        for i in range(number):
+            for e in encoded:
+                _loads(e)
+        loads_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(number):
+            for d in docs:
+                _dumps(d)
+        dumps_seconds = time.perf_counter() - start
+        results[name] = {
+            'bytes': nbytes,
+            'loads_seconds': loads_seconds,
+            'dumps_seconds': dumps_seconds,
+            'loads_mb_per_second': nbytes / 1e6 / loads_seconds if loads_seconds > 0 else 0.0,
+            'dumps_mb_per_second': nbytes / 1e6 / dumps_seconds if dumps_seconds > 0 else 0.0,
+        }
+    return results
+
+
+def benchmark_summary(results):
+    """ Get text table of benchmark() results """
+    lines = ['{:<10} {:>14} {:>14}'.format('Codec', 'Parse MB/s', 'Serialize MB/s')]
+    for name, r in results.items():
+        lines.append('{:<10} {:>14.1f} {:>14.1f}'.format(name, r['loads_mb_per_second'], r['dumps_mb_per_second']))
+    return '\n'.join(lines)
@@ -1,7 +1,7 @@
 import logging
-import functools
 import os
 
+from collections import OrderedDict
 from datetime import datetime
 
 from .catalog import Catalog
@@ -9,16 +9,19 @@ from satstac import STACError, utils
 
 logger = logging.getLogger(__name__)
 
+# maximum number of sub-catalog paths remembered by each Collection
+SUBCATALOG_REGISTRY_SIZE = 10000
+
 
 class Collection(Catalog):
 
-    '''
+    __slots__ = ('_subcatalogs',)
+
     def __init__(self, *args, **kwargs):
-        """ Initialize a scene object """
+        """ Initialize a collection """
         super(Collection, self).__init__(*args, **kwargs)
-        # determine common_name to asset mapping
-        # it will map if an asset contains only a single band
-    '''
+        # sub-catalog path: sub-catalog filename, for sub-catalogs known to exist
+        self._subcatalogs = OrderedDict()
 
     @property
     def title(self):
@@ -49,52 +52,95 @@ class Collection(Catalog):
         """ Get dictionary of summaries """
         return self._data.get('summaries', {})
 
-    @functools.lru_cache()
     def parent_catalog(self, item, path_template):
         """ Given relative filename to a new Item find parent catalog """
-        cat = self
         path = item.get_path(os.path.dirname(path_template))
+        if path == '':
+            return self.filename
+        parts = utils.splitall(path)
         var_names = [v.strip('$').strip('{}') for v in utils.splitall(path_template)]
-        for i, d in enumerate(utils.splitall(path)):
-            fname = os.path.join(os.path.join(cat.path, d), 'catalog.json')
+        paths = [os.path.join(self.path, *parts[:i+1]) for i in range(len(parts))]
+        # start from the deepest sub-catalog already known
+        for start in range(len(parts), 0, -1):
+            if paths[start-1] in self._subcatalogs:
+                self._subcatalogs.move_to_end(paths[start-1])
+                if start == len(parts):
+                    return self._subcatalogs[paths[start-1]]
+                cat = Catalog.open(self._subcatalogs[paths[start-1]])
+                break
+        else:
+            start = 0
+            cat = self
+        for i in range(start, len(parts)):
+            fname = os.path.join(paths[i], 'catalog.json')
             # open existing sub-catalog or create new one
             try:
                 subcat = Catalog.open(fname)
             except STACError as err:
                 # create a new sub-catalog
-                subcat = self.create(id=d, description='%s catalog' % var_names[i])
+                subcat = self.create(id=parts[i], description='%s catalog' % var_names[i])
                 subcat.save(filename=fname)
                 # add the sub-catalog to this catalog
                 cat.add_catalog(subcat)
+            self._subcatalogs[paths[i]] = subcat.filename
             cat = subcat
+        while len(self._subcatalogs) > SUBCATALOG_REGISTRY_SIZE:
+            self._subcatalogs.popitem(last=False)
         return cat.filename
 
     def add_item(self, item, filename_template='${id}.json'):
         """ Add an item to this collection """
         start = datetime.now()
+        self.add_items([item], filename_template=filename_template)
+        logger.debug('Added %s in %s seconds' % (item.filename, datetime.now()-start))
+        return self
+
+    def add_items(self, items, filename_template='${id}.json'):
+        """ Add multiple items to this collection, saving each parent catalog once
+
+        Each Item is saved as it is added while links to it are collected per parent
+        catalog, then every parent catalog touched is rewritten a single time.
+        Returns a dictionary of throughput statistics (items_per_second is None if no
+        measurable time passed).
+        """
+        start = datetime.now()
         if self.filename is None:
             raise STACError('Save catalog before adding items')
-        item_link = os.path.join(item.get_path(os.path.join(filename_template)))
-        item_fname = os.path.join(self.path, item_link)
-        item_path = os.path.dirname(item_fname)
         root_link = self.links('root')[0]
-        #root_path = os.path.dirname(root_link)
-        parent = Catalog.open(self.parent_catalog(item, filename_template))
-        
-        # create link to item
-        parent.add_link('item', os.path.relpath(item_fname, parent.path))
-        parent.save()
-
-        # create links from item
-        item.clean_hierarchy()
-        item.add_link('root', os.path.relpath(root_link, item_path))
-        item.add_link('parent', os.path.relpath(parent.filename, item_path))
-        # this assumes the item has been added to a Collection, not a Catalog
-        item.add_link('collection', os.path.relpath(self.filename, item_path))
-
-        # save item
-        
-        item.save(filename=item_fname)
-        logger.debug('Added %s in %s seconds' % (item.filename, datetime.now()-start))
-        
-        return self
+        # parent catalog filename: [item filenames]
+        parents = {}
+        nitems = 0
+        for item in items:
+            item_link = os.path.join(item.get_path(os.path.join(filename_template)))
+            item_fname = os.path.join(self.path, item_link)
+            item_path = os.path.dirname(item_fname)
+            parent_fname = self.parent_catalog(item, filename_template)
+            parents.setdefault(parent_fname, []).append(item_fname)
+
+            # create links from item
+            item.clean_hierarchy()
+            item.add_link('root', os.path.relpath(root_link, item_path))
+            item.add_link('parent', os.path.relpath(parent_fname, item_path))
+            # this assumes the item has been added to a Collection, not a Catalog
+            item.add_link('collection', os.path.relpath(self.filename, item_path))
+
+            # save item
+            item.save(filename=item_fname)
+            nitems += 1
+
+        # create links to items
+        for parent_fname, item_fnames in parents.items():
+            parent = Catalog.open(parent_fname)
+            for item_fname in item_fnames:
+                parent.add_link('item', os.path.relpath(item_fname, parent.path))
+            parent.save()
+
+        seconds = (datetime.now() - start).total_seconds()
+        stats = {
+            'items': nitems,
+            'parents': len(parents),
+            'seconds': seconds,
+            'items_per_second': nitems / seconds if seconds > 0 else None
+        }
+        logger.debug('Added %s items to %s parent catalogs in %s seconds' % (nitems, len(parents), seconds))
+        return stats
@@ -0,0 +1,87 @@
+import gzip
+import io
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# file extension: compression
+EXTENSIONS = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+}
+
+# default compression levels, favouring speed as catalogs are written often
+LEVELS = {
+    'gzip': 6,
+    'zstd': 3,
+}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError('zstd compression requires the zstandard package (pip install zstandard)')
+    return zstandard
+
+
+def detect(filename):
+    """ Get compression of filename from its extension (None if not compressed) """
+    for ext, compression in EXTENSIONS.items():
+        if filename.endswith(ext):
+            return compression
+    return None
+
+
+def _check(compression):
+    if compression is not None and compression not in LEVELS:
+        raise ValueError('Unknown compression %s, use one of %s' % (compression, ', '.join(LEVELS.keys())))
+
+
+def compress(data, compression, level=None):
+    """ Compress bytes with compression ('gzip', 'zstd' or None for no compression) """
+    _check(compression)
+    if compression is None:
+        return data
+    level = LEVELS[compression] if level is None else level
+    if compression == 'gzip':
+        # mtime of 0 so the same document always compresses to the same bytes
+        # (gzip.compress only accepts mtime from Python 3.8)
+        out = io.BytesIO()
+        with gzip.GzipFile(fileobj=out, mode='wb', compresslevel=level, mtime=0) as f:
+            f.write(data)
+        return out.getvalue()
+    return _zstandard().ZstdCompressor(level=level).compress(data)
+
+
+def decompress(data, compression):
+    """ Decompress bytes compressed with compression """
+    _check(compression)
+    if compression is None:
+        return data
+    return b''.join(iter_decompress([data], compression))
+
+
+def iter_decompress(chunks, compression):
+    """ Generator of decompressed chunks from an iterable of compressed chunks """
+    _check(compression)
+    if compression is None:
+        yield from chunks
+        return
+    if compression == 'gzip':
+        def decompressor():
+            return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    else:
+        zstandard = _zstandard()
+
+        def decompressor():
+            return zstandard.ZstdDecompressor().decompressobj()
+    d = decompressor()
+    for chunk in chunks:
+        while chunk:
+            yield d.decompress(chunk)
+            # concatenated members (e.g., appended files) each need a new decompressor
+            chunk = d.unused_data if d.eof else b''
+            if d.eof:
+                d = decompressor()
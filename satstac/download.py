@@ -0,0 +1,99 @@
+import logging
+import os
+import threading
+import time
+import traceback
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from . import utils
+from .item import FILENAME_TEMPLATE
+
+logger = logging.getLogger(__name__)
+
+# result of downloading one asset, error is None if successful
+DownloadResult = namedtuple('DownloadResult', ['item', 'key', 'url', 'path', 'bytes', 'seconds', 'error'])
+
+
+class DownloadManager(object):
+    """ Download assets concurrently on a bounded pool of threads
+
+    No more than `host_connections` downloads run against a single host at a time,
+    and `progress`, if provided, is called with the stats() dictionary after each asset.
+    """
+
+    def __init__(self, workers=4, host_connections=None, chunk_size=utils.DOWNLOAD_CHUNK_SIZE, progress=None):
+        self.workers = workers
+        self.host_connections = host_connections or workers
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._reset(0)
+
+    def _reset(self, total):
+        self._stats = {'total': total, 'completed': 0, 'failed': 0, 'bytes': 0, 'start': time.time()}
+
+    def _host(self, url):
+        """ Get semaphore limiting connections to the host of url """
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.host_connections)
+            return self._hosts[host]
+
+    def stats(self):
+        """ Get progress and throughput of the current or last run """
+        stats = dict(self._stats)
+        stats['seconds'] = time.time() - stats.pop('start')
+        stats['bytes_per_second'] = stats['bytes'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        return stats
+
+    def _download(self, item, key, overwrite=False, filename_template=FILENAME_TEMPLATE, **kwargs):
+        """ Download asset key of item, returning a DownloadResult """
+        start = time.time()
+        asset = item.asset(key)
+        url = asset['href'] if asset is not None else None
+        path, nbytes, error = None, 0, None
+        try:
+            if asset is None:
+                raise Exception('No such asset (%s)' % key)
+            path = item.download_path(key, filename_template=filename_template)
+            if not os.path.exists(path) or overwrite:
+                with self._host(url):
+                    utils.download_file(url, filename=path, chunk_size=self.chunk_size, **kwargs)
+            nbytes = os.path.getsize(path)
+        except Exception as e:
+            error = str(e)
+            logger.error('Unable to download %s: %s' % (url, error))
+            logger.debug(traceback.format_exc())
+        result = DownloadResult(item, key, url, path, nbytes, time.time() - start, error)
+        with self._lock:
+            self._stats['completed'] += 1
+            self._stats['bytes'] += nbytes
+            if error is not None:
+                self._stats['failed'] += 1
+        if self.progress is not None:
+            self.progress(self.stats())
+        return result
+
+    def download_assets(self, items, keys=None, **kwargs):
+        """ Download assets keys (all assets if None) of items, returning a list of DownloadResults
+
+        Keywords are passed on as for Item.download (overwrite, filename_template, requester_pays, headers)
+        """
+        jobs = []
+        for item in items:
+            _keys = item.assets.keys() if keys is None else keys
+            jobs += [(item, key) for key in _keys]
+        self._reset(len(jobs))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self._download, item, key, **kwargs) for item, key in jobs]
+            results = [f.result() for f in futures]
+        stats = self.stats()
+        logger.info('Downloaded %s assets (%s failed, %s bytes) in %.2f seconds (%.0f bytes/sec)' %
+                    (stats['completed'], stats['failed'], stats['bytes'], stats['seconds'], stats['bytes_per_second']))
+        return results
+
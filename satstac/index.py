@@ -0,0 +1,302 @@
+import bisect
+import datetime
+import json
+import logging
+import math
+
+from .utils import parse_datetime, parse_datetimes
+
+logger = logging.getLogger(__name__)
+
+
+def hashable(value):
+    """ Get a hashable key for a property value (lists and dicts are serialized) """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True)
+
+
+class PropertyTable(object):
+    """ Column store of Item properties
+
+    Each column is built once, on first use, from a list of Items and holds the
+    value of one property for every Item along with a categorical code table
+    mapping each distinct value to the positions of the Items that have it.
+    The special columns 'date' and 'id' hold Item dates and ids.
+    """
+
+    def __init__(self, items):
+        self._items = items
+        # key: [values]
+        self._columns = {}
+        # key: {value: [positions]}
+        self._codes = {}
+        self._bbox_index = None
+        self._time_index = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def column(self, key):
+        """ Get list of values of property key, in Item order """
+        if key not in self._columns:
+            if key == 'date':
+                self._columns[key] = [dt.date() for dt in self.datetimes()]
+            elif key == 'id':
+                self._columns[key] = [i.id for i in self._items]
+            else:
+                self._columns[key] = [i[key] for i in self._items]
+        return self._columns[key]
+
+    def datetimes(self):
+        """ Get list of Item datetimes, parsing any not already parsed in a single batch """
+        todo = [i for i in self._items if i._datetime is None or i._datetime[0] != i['datetime']]
+        vals = [i['datetime'] for i in todo]
+        for i, val, dt in zip(todo, vals, parse_datetimes(vals)):
+            i._datetime = (val, dt)
+        return [i.datetime for i in self._items]
+
+    def codes(self, key):
+        """ Get dictionary of distinct values of property key to positions of Items having it """
+        if key not in self._codes:
+            codes = {}
+            for pos, val in enumerate(self.column(key)):
+                codes.setdefault(hashable(val), []).append(pos)
+            self._codes[key] = codes
+        return self._codes[key]
+
+    def positions(self, key, values):
+        """ Get positions of Items where property key is one of values, grouped by value """
+        codes = self.codes(key)
+        positions = []
+        for val in values:
+            positions += codes.get(hashable(val), [])
+        return positions
+
+    def unique(self, key, positions=None):
+        """ Get distinct values of property key, for Items at positions if provided """
+        if positions is None:
+            codes = self.codes(key)
+            column = self.column(key)
+            return [column[pos[0]] for pos in codes.values()]
+        column = self.column(key)
+        vals = {}
+        for pos in positions:
+            vals.setdefault(hashable(column[pos]), column[pos])
+        return list(vals.values())
+
+    def bbox_index(self):
+        """ Get spatial index of Item bounding boxes, built on first use """
+        if self._bbox_index is None:
+            self._bbox_index = BBoxIndex([i._data.get('bbox') for i in self._items])
+        return self._bbox_index
+
+    def time_index(self):
+        """ Get temporal index of Item datetimes, built on first use """
+        if self._time_index is None:
+            self._time_index = TimeIndex(self.datetimes())
+        return self._time_index
+
+    def subset(self, positions):
+        """ Get a new table of the Items at positions, reusing columns and indexes already built """
+        table = PropertyTable([self._items[pos] for pos in positions])
+        for key, column in self._columns.items():
+            table._columns[key] = [column[pos] for pos in positions]
+        if self._bbox_index is not None:
+            table._bbox_index = self._bbox_index.subset(positions)
+        if self._time_index is not None:
+            table._time_index = self._time_index.subset(positions)
+        return table
+
+
+def bbox2d(bbox):
+    """ Get (minx, miny, maxx, maxy) from a 2D or 3D bounding box """
+    if bbox is None:
+        return None
+    if len(bbox) == 6:
+        return (bbox[0], bbox[1], bbox[3], bbox[4])
+    return tuple(bbox[0:4])
+
+
+def split_antimeridian(bbox):
+    """ Get tuple of parts of a 2D bbox, two if it crosses the antimeridian (minx > maxx) """
+    if bbox[0] > bbox[2]:
+        return ((bbox[0], bbox[1], 180.0, bbox[3]), (-180.0, bbox[1], bbox[2], bbox[3]))
+    return (bbox,)
+
+
+class BBoxIndex(object):
+    """ Uniform grid spatial index of bounding boxes
+
+    The extent of all bounding boxes is divided into a grid of size x size cells
+    (by default about 4 boxes per cell) and each box is listed in every cell it
+    overlaps, so a query only tests boxes in the cells it overlaps. Boxes crossing
+    the antimeridian (minx > maxx), indexed or queried, are split in two.
+    """
+
+    def __init__(self, bboxes, size=None):
+        # parts of each box, None if it has no bbox
+        self._bboxes = [split_antimeridian(bbox2d(b)) if b is not None else None for b in bboxes]
+        valid = [part for parts in self._bboxes if parts is not None for part in parts]
+        # whether any box crosses the antimeridian, otherwise queries test the only part directly
+        self._split = any(parts is not None and len(parts) == 2 for parts in self._bboxes)
+        if size is None:
+            size = max(1, int(math.sqrt(len(valid) / 4.0)))
+        self.size = size
+        if len(valid) > 0:
+            self.extent = (min(b[0] for b in valid), min(b[1] for b in valid),
+                           max(b[2] for b in valid), max(b[3] for b in valid))
+        else:
+            self.extent = (0.0, 0.0, 0.0, 0.0)
+        self._dx = (self.extent[2] - self.extent[0]) / size or 1.0
+        self._dy = (self.extent[3] - self.extent[1]) / size or 1.0
+        # (column, row): [positions]
+        self._cells = {}
+        for pos, parts in enumerate(self._bboxes):
+            if parts is not None:
+                cells = self._cover(parts[0]) if len(parts) == 1 else set(self._cover(parts[0]) + self._cover(parts[1]))
+                for cell in cells:
+                    self._cells.setdefault(cell, []).append(pos)
+
+    def __len__(self):
+        return len(self._bboxes)
+
+    def _cover(self, bbox):
+        """ Get grid cells overlapped by bbox """
+        def cell(val, start, step):
+            return min(max(int((val - start) / step), 0), self.size - 1)
+        c0, c1 = cell(bbox[0], self.extent[0], self._dx), cell(bbox[2], self.extent[0], self._dx)
+        r0, r1 = cell(bbox[1], self.extent[1], self._dy), cell(bbox[3], self.extent[1], self._dy)
+        return [(c, r) for c in range(c0, c1 + 1) for r in range(r0, r1 + 1)]
+
+    def _candidates(self, queries):
+        """ Get positions of boxes in the cells overlapped by any of the query boxes """
+        ext = self.extent
+        candidates = set()
+        for bbox in queries:
+            if len(self._cells) == 0 or bbox[0] > ext[2] or bbox[2] < ext[0] or bbox[1] > ext[3] or bbox[3] < ext[1]:
+                continue
+            for cell in self._cover(bbox):
+                candidates.update(self._cells.get(cell, []))
+        return candidates
+
+    def intersects(self, bbox):
+        """ Get sorted positions of boxes intersecting bbox """
+        queries = split_antimeridian(bbox2d(bbox))
+        boxes = self._bboxes
+        if not self._split and len(queries) == 1:
+            q = queries[0]
+            return sorted(p for p in self._candidates(queries)
+                          if boxes[p][0][0] <= q[2] and boxes[p][0][2] >= q[0] and boxes[p][0][1] <= q[3] and boxes[p][0][3] >= q[1])
+        return sorted(p for p in self._candidates(queries)
+                      if any(b[0] <= q[2] and b[2] >= q[0] and b[1] <= q[3] and b[3] >= q[1]
+                             for b in boxes[p] for q in queries))
+
+    def within(self, bbox):
+        """ Get sorted positions of boxes entirely within bbox """
+        queries = split_antimeridian(bbox2d(bbox))
+        boxes = self._bboxes
+        if not self._split and len(queries) == 1:
+            q = queries[0]
+            return sorted(p for p in self._candidates(queries)
+                          if boxes[p][0][0] >= q[0] and boxes[p][0][2] <= q[2] and boxes[p][0][1] >= q[1] and boxes[p][0][3] <= q[3])
+        return sorted(p for p in self._candidates(queries)
+                      if all(any(b[0] >= q[0] and b[2] <= q[2] and b[1] >= q[1] and b[3] <= q[3] for q in queries)
+                             for b in boxes[p]))
+
+    def subset(self, positions):
+        """ Get index of the boxes at positions, keeping the grid and cell assignments """
+        index = BBoxIndex.__new__(BBoxIndex)
+        index.size, index.extent, index._dx, index._dy = self.size, self.extent, self._dx, self._dy
+        index._split = self._split
+        index._bboxes = [self._bboxes[pos] for pos in positions]
+        # old position: [new positions]
+        remap = {}
+        for new, old in enumerate(positions):
+            remap.setdefault(old, []).append(new)
+        index._cells = {}
+        for cell, olds in self._cells.items():
+            news = [new for old in olds if old in remap for new in remap[old]]
+            if len(news) > 0:
+                index._cells[cell] = news
+        return index
+
+
+def utc(dt):
+    """ Get timezone aware datetime from a datetime or string, naive datetimes are assumed UTC """
+    if isinstance(dt, str):
+        dt = parse_datetime(dt)
+    elif not isinstance(dt, datetime.datetime):
+        # a date
+        dt = datetime.datetime(dt.year, dt.month, dt.day)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt
+
+
+class TimeIndex(object):
+    """ Sorted index of datetimes
+
+    Positions are kept sorted by datetime (for range and nearest queries) and by
+    date in the datetime's own timezone (for per-day lookups, matching Item.date),
+    so every query is a bisection followed by a scan of the matches.
+    """
+
+    def __init__(self, datetimes):
+        self._datetimes = [utc(dt) for dt in datetimes]
+        self._order = sorted(range(len(self._datetimes)), key=lambda p: self._datetimes[p])
+        self._times = [self._datetimes[p] for p in self._order]
+        dates = [dt.date() for dt in datetimes]
+        self._day_order = sorted(range(len(dates)), key=lambda p: dates[p])
+        self._days = [dates[p] for p in self._day_order]
+
+    def __len__(self):
+        return len(self._datetimes)
+
+    def between(self, start=None, end=None):
+        """ Get sorted positions of datetimes from start to end (inclusive) """
+        i0 = 0 if start is None else bisect.bisect_left(self._times, utc(start))
+        i1 = len(self._times) if end is None else bisect.bisect_right(self._times, utc(end))
+        return sorted(self._order[i0:i1])
+
+    def nearest(self, dt):
+        """ Get position of the datetime closest to dt (None if empty) """
+        if len(self._times) == 0:
+            return None
+        dt = utc(dt)
+        i = bisect.bisect_left(self._times, dt)
+        if i == len(self._times) or (i > 0 and dt - self._times[i-1] <= self._times[i] - dt):
+            i -= 1
+        return self._order[i]
+
+    def day(self, date):
+        """ Get sorted positions of datetimes on date """
+        i0 = bisect.bisect_left(self._days, date)
+        i1 = bisect.bisect_right(self._days, date, lo=i0)
+        return sorted(self._day_order[i0:i1])
+
+    def dates(self):
+        """ Get sorted list of distinct dates """
+        dates = []
+        i = 0
+        while i < len(self._days):
+            dates.append(self._days[i])
+            i = bisect.bisect_right(self._days, self._days[i], lo=i)
+        return dates
+
+    def subset(self, positions):
+        """ Get index of the datetimes at positions, without sorting again """
+        index = TimeIndex.__new__(TimeIndex)
+        index._datetimes = [self._datetimes[pos] for pos in positions]
+        # old position: [new positions]
+        remap = {}
+        for new, old in enumerate(positions):
+            remap.setdefault(old, []).append(new)
+        index._order = [new for old in self._order if old in remap for new in remap[old]]
+        index._times = [index._datetimes[p] for p in index._order]
+        days = [(new, day) for old, day in zip(self._day_order, self._days) if old in remap for new in remap[old]]
+        index._day_order = [d[0] for d in days]
+        index._days = [d[1] for d in days]
+        return index
@@ -5,7 +5,6 @@ import traceback
 
 from string import Formatter, Template
 from datetime import datetime
-from dateutil.parser import parse as dateparse
 
 from satstac import __version__, STACError, Thing, utils
 
@@ -16,6 +15,8 @@ FILENAME_TEMPLATE = os.getenv('SATSEARCH_FILENAME_TEMPLATE', '${collection}/${da
 
 class Item(Thing):
 
+    __slots__ = ('_assets_by_common_name', '_collection', '_datetime')
+
     def __init__(self, *args, **kwargs):
         """ Initialize a scene object """
         super(Item, self).__init__(*args, **kwargs)
@@ -23,6 +24,8 @@ class Item(Thing):
         self._assets_by_common_name = None
         # collection instance
         self._collection = kwargs.pop('collection', None)
+        # (datetime string, parsed datetime)
+        self._datetime = None
         # TODO = allow passing in of collection (needed for FC catalogs)
 
     def collection(self):
@@ -56,7 +59,10 @@ class Item(Thing):
 
     @property
     def datetime(self):
-        return dateparse(self['datetime'])
+        val = self['datetime']
+        if self._datetime is None or self._datetime[0] != val:
+            self._datetime = (val, utils.parse_datetime(val))
+        return self._datetime[1]
 
     @property
     def geometry(self):
@@ -77,9 +83,9 @@ class Item(Thing):
         """ Get assets by common band name (only works for assets containing 1 band """
         if self._assets_by_common_name is None:
             self._assets_by_common_name = {}
+            col = self.collection()._data if self.collection() is not None else {}
             for a in self.assets:
                 bands = []
-                col = self.collection()._data
                 if 'eo:bands' in self.assets[a]:
                     bands = self.assets[a]['eo:bands']
                 elif 'item_assets' in col:
@@ -116,23 +122,35 @@ class Item(Thing):
                 subs[key] = self[key.replace('__colon__', ':')]
         return Template(_template).substitute(**subs).replace('__colon__', ':')
 
-    def download_assets(self, keys=None, **kwargs):
-        """ Download multiple assets """
+    def download_assets(self, keys=None, workers=None, **kwargs):
+        """ Download multiple assets, concurrently on `workers` threads if provided """
         if keys is None:
             keys = self._data['assets'].keys()
+        if workers:
+            # imported here as satstac.download imports this module
+            from .download import DownloadManager
+            results = DownloadManager(workers=workers).download_assets([self], keys=keys, **kwargs)
+            return [r.path if r.error is None else None for r in results]
         filenames = []
         for key in keys:
             filenames.append(self.download(key, **kwargs))
         return filenames
 
+    def download_path(self, key, filename_template=FILENAME_TEMPLATE):
+        """ Get local filename an asset is downloaded to (None if no such asset) """
+        asset = self.asset(key)
+        if asset is None:
+            return None
+        ext = os.path.splitext(asset['href'])[1]
+        return self.get_path(filename_template) + '_' + key + ext
+
     def download(self, key, overwrite=False, filename_template=FILENAME_TEMPLATE, requester_pays=False, headers={}):
         """ Download this key (e.g., a band, or metadata file) from the scene """
         asset = self.asset(key)
         if asset is None:
             return None
 
-        ext = os.path.splitext(asset['href'])[1]
-        filename = self.get_path(filename_template) + '_' + key + ext
+        filename = self.download_path(key, filename_template=filename_template)
         if not os.path.exists(filename) or overwrite:
             try:
                 utils.download_file(asset['href'], filename=filename, requester_pays=requester_pays, headers=headers)
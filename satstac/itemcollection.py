@@ -1,16 +1,65 @@
-import json
+import codecs
 import os.path as op
-import requests
 
 from logging import getLogger
+from . import codec, metrics, session, storage
 from .catalog import STAC_VERSION
 from .collection import Collection
+from .compression import compress, decompress, detect, iter_decompress
+from .download import DownloadManager
+from .index import PropertyTable
+from .query import Query
 from .item import Item
 from .thing import STACError
-from .utils import terminal_calendar, get_s3_signed_url
+from .utils import terminal_calendar, iter_json_arrays
 
 logger = getLogger(__name__)
 
+# characters read at a time when streaming files
+CHUNK_SIZE = 1024 * 1024
+
+
+def ndjson_ranges(filename, nchunks):
+    """ Split a newline-delimited JSON file into nchunks (start, end) byte ranges
+
+    Each line belongs to the range containing its first byte, see read_ndjson_range
+    """
+    size = op.getsize(filename)
+    bounds = [int(size * i / nchunks) for i in range(nchunks)] + [size]
+    return [(bounds[i], bounds[i+1]) for i in range(nchunks) if bounds[i+1] > bounds[i]]
+
+
+def iter_ndjson_range(filename, start=0, end=None):
+    """ Iterate over records of a newline-delimited JSON file starting in byte range [start, end) """
+    with open(filename, 'rb') as f:
+        if start > 0:
+            # the line containing start-1 belongs to the previous range
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        lines = metrics.timed_chunks('open', filename, f)
+        try:
+            for line in lines:
+                if end is not None and pos >= end:
+                    break
+                pos += len(line)
+                line = line.strip()
+                if line:
+                    yield codec.loads(line)
+        finally:
+            lines.close()
+
+
+def read_ndjson_range(filename, start=0, end=None):
+    """ Read records of a newline-delimited JSON file into lists of (collections, features) """
+    collections, features = [], []
+    for rec in iter_ndjson_range(filename, start, end):
+        if rec.get('type') == 'Feature':
+            features.append(rec)
+        else:
+            collections += rec.get('collections', [])
+    return collections, features
+
 
 class ItemCollection(object):
     """ A GeoJSON FeatureCollection of STAC Items with associated Collections """
@@ -19,6 +68,7 @@ class ItemCollection(object):
         """ Initialize with a list of Item objects """
         self._collections = collections
         self._items = items
+        self._table = None
         # link Items to their Collections
         cols = {c.id: c for c in self._collections}
         for i in self._items:
@@ -31,35 +81,134 @@ class ItemCollection(object):
     @classmethod
     def open_remote(self, url, headers={}):
         """ Open remote file """
-        resp = requests.get(url, headers=headers)
+        resp = session.get(url, headers=headers)
         if resp.status_code == 200:
-            dat = resp.text
+            dat = resp.content
         else:
             raise STACError('Unable to open %s' % url)
-        return json.loads(dat)
+        return codec.loads(dat)
 
     @classmethod
-    def open(cls, filename):
+    def open(cls, filename, compression=None):
         """ Load an Items class from a GeoJSON FeatureCollection """
-        """ Open an existing JSON data file """
+        """ Open an existing JSON data file, decompressed with compression (by default from the extension) """
         logger.debug('Opening %s' % filename)
-        if filename[0:5] == 'https':
-            try:
-                data = cls.open_remote(filename)
-            except STACError as err:
-                # try signed URL
-                url, headers = get_s3_signed_url(filename)
-                data = cls.open_remote(url, headers)
-        else:
-            if op.exists(filename):
-                data = open(filename).read()
-                data = json.loads(data)
-            else:
-                raise STACError('%s does not exist locally' % filename)
+        try:
+            with metrics.timer('open', filename) as event:
+                data = storage.get(filename).read(filename)
+                event['bytes'] = len(data)
+        except OSError as err:
+            raise STACError(str(err))
+        with metrics.timer('parse', filename) as event:
+            event['bytes'] = len(data)
+            data = codec.loads(decompress(data, compression or detect(filename)))
         collections = [Collection(col) for col in data.get('collections', [])]
         items = [Item(feature) for feature in data['features']]
         return cls(items, collections=collections)
 
+    @classmethod
+    def stream(cls, filename, chunk_size=CHUNK_SIZE, compression=None):
+        """ Iterate over Items in a GeoJSON FeatureCollection without loading the whole file
+
+        Items are parsed and yielded one at a time, so memory use does not depend on
+        the size of the file. Items are linked to the Collections in the file. These are
+        read first when written before the Items (as by ItemCollection.save), otherwise
+        the file is read twice, first for the Collections. Compressed files are
+        decompressed as they are read.
+        """
+        logger.debug('Streaming %s' % filename)
+        cols = {}
+        # whether all collections in the file have been read
+        scanned = False
+        for key, val in iter_json_arrays(cls._read_chunks(filename, chunk_size, compression), ['features', 'collections']):
+            if key == 'collections':
+                col = Collection(val)
+                cols[col.id] = col
+                scanned = True
+            elif key == 'features':
+                item = Item(val)
+                col = val.get('collection', None)
+                if col is not None and col not in cols and not scanned:
+                    # collections after features, as written by earlier versions of sat-stac
+                    logger.debug('Reading collections of %s before its features' % filename)
+                    cols = cls._stream_collections(filename, chunk_size, compression)
+                    scanned = True
+                if col is not None and col in cols:
+                    item._collection = cols[col]
+                yield item
+
+    @classmethod
+    def _stream_collections(cls, filename, chunk_size, compression=None):
+        """ Get {id: Collection} of the collections in a FeatureCollection, one feature at a time """
+        cols = {}
+        for key, val in iter_json_arrays(cls._read_chunks(filename, chunk_size, compression), ['features', 'collections']):
+            if key == 'collections':
+                col = Collection(val)
+                cols[col.id] = col
+        return cols
+
+    @classmethod
+    def _read_chunks(cls, filename, chunk_size, compression=None):
+        """ Generator of text chunks from a (compressed) file on any storage backend """
+        # JSON is always UTF-8
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        chunks = metrics.timed_chunks('open', filename, storage.get(filename).iter_chunks(filename, chunk_size=chunk_size))
+        try:
+            for chunk in iter_decompress(chunks, compression or detect(filename)):
+                yield decoder.decode(chunk)
+        except OSError as err:
+            raise STACError(str(err))
+        yield decoder.decode(b'', final=True)
+
+    @classmethod
+    def stream_ndjson(cls, filename, start=0, end=None):
+        """ Iterate over Items in a local newline-delimited JSON file (optionally in a byte range)
+
+        Items are linked to Collections from header records that appear before them
+        """
+        cols = {}
+        for rec in iter_ndjson_range(filename, start, end):
+            if rec.get('type') == 'Feature':
+                item = Item(rec)
+                col = rec.get('collection', None)
+                if col is not None and col in cols:
+                    item._collection = cols[col]
+                yield item
+            else:
+                for col in rec.get('collections', []):
+                    cols[col['id']] = Collection(col)
+
+    @classmethod
+    def open_ndjson(cls, filename, workers=None):
+        """ Load an ItemCollection from a local newline-delimited JSON file
+
+        If `workers` is provided the file is split into byte ranges parsed by that
+        many processes. Unlike open(), this does not use the storage backends as it
+        needs to seek within the file.
+        """
+        logger.debug('Opening %s' % filename)
+        if not op.exists(filename):
+            raise STACError('%s does not exist locally' % filename)
+        if workers:
+            # imported here as multiprocessing is slow to import
+            from concurrent.futures import ProcessPoolExecutor
+            ranges = ndjson_ranges(filename, workers)
+            # reads in worker processes are not recorded, so record them all here
+            with metrics.timer('open', filename) as event:
+                event['bytes'] = op.getsize(filename)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(read_ndjson_range, [filename] * len(ranges),
+                                                [r[0] for r in ranges], [r[1] for r in ranges]))
+        else:
+            results = [read_ndjson_range(filename)]
+        collections = {}
+        items = []
+        for cols, features in results:
+            for col in cols:
+                collections.setdefault(col['id'], col)
+            items += [Item(f) for f in features]
+        return cls(items, collections=[Collection(col) for col in collections.values()])
+
     @classmethod
     def load(cls, *args, **kwargs):
         """ Load an Items class from a GeoJSON FeatureCollection """
@@ -73,9 +222,43 @@ class ItemCollection(object):
     def __getitem__(self, index):
         return self._items[index]
 
+    def table(self):
+        """ Get column store of Item properties, built on first use """
+        if self._table is None or self._table._items is not self._items or len(self._table) != len(self._items):
+            self._table = PropertyTable(self._items)
+        return self._table
+
+    def select(self, positions):
+        """ Get new ItemCollection of the Items at positions """
+        table = self.table().subset(positions)
+        items = ItemCollection(table._items, collections=self._collections)
+        items._table = table
+        return items
+
+    def intersects(self, bbox):
+        """ Get new ItemCollection of Items whose bounding box intersects bbox """
+        return self.select(self.table().bbox_index().intersects(bbox))
+
+    def within(self, bbox):
+        """ Get new ItemCollection of Items whose bounding box is within bbox """
+        return self.select(self.table().bbox_index().within(bbox))
+
+    def between(self, start=None, end=None):
+        """ Get new ItemCollection of Items with datetime from start to end (inclusive) """
+        return self.select(self.table().time_index().between(start, end))
+
+    def nearest(self, dt):
+        """ Get the Item with datetime closest to dt """
+        pos = self.table().time_index().nearest(dt)
+        return None if pos is None else self._items[pos]
+
+    def datetimes(self):
+        """ Get list of datetimes of all Items, parsing them in a single batch """
+        return self.table().datetimes()
+
     def dates(self):
         """ Get sorted list of dates for all scenes """
-        return sorted(list(set([s.date for s in self._items])))
+        return self.table().time_index().dates()
 
     def collection(self, id):
         """ Get collection records for this list of scenes """
@@ -87,10 +270,11 @@ class ItemCollection(object):
 
     def properties(self, key, date=None):
         """ Set of values for 'key' property in Items, for specific date if provided """
+        table = self.table()
         if date is None:
-            return list(set([i[key] for i in self._items]))
+            return table.unique(key)
         else:
-            return list(set([i[key] for i in self._items if i.date == date]))    
+            return table.unique(key, table.time_index().day(date))
 
     def summary(self, params=[]):
         """ Print summary of all scenes """
@@ -130,10 +314,37 @@ class ItemCollection(object):
                 txt += ''.join([f"{vals[i]:{w[i]}}" for i in range(len(w))]) + '\n'
         return txt
 
-    def save(self, filename, **kwargs):
-        """ Save scene metadata """
-        with open(filename, 'w') as f:
-            f.write(json.dumps(self.geojson(**kwargs)))
+    def save(self, filename, compression=None, **kwargs):
+        """ Save scene metadata, to any storage backend (see satstac.storage)
+
+        The file is compressed with compression ('gzip' or 'zstd'), by default the
+        compression of the file extension (.gz or .zst)
+        """
+        with metrics.timer('serialize', filename) as event:
+            data = compress(codec.dumps(self.geojson(**kwargs)), compression or detect(filename))
+            event['bytes'] = len(data)
+        try:
+            with metrics.timer('save', filename) as event:
+                event['bytes'] = len(data)
+                storage.get(filename).write(filename, data)
+        except OSError as err:
+            raise STACError(str(err))
+
+    def save_ndjson(self, filename, append=False, **kwargs):
+        """ Save as newline-delimited JSON, a header record with collections and one Item per line
+
+        With `append` Items (and a header record for their Collections) are added to the end
+        of an existing file. Unlike save(), filename must be a local file as the storage
+        backends cannot append.
+        """
+        header = self.geojson(**kwargs)
+        del header['features']
+        mode = 'ab' if append else 'wb'
+        with metrics.timer('save', filename) as event, open(filename, mode) as f:
+            if not append or len(self._collections) > 0 or f.tell() == 0:
+                event['bytes'] += f.write(codec.dumps(header) + b'\n')
+            for i in self._items:
+                event['bytes'] += f.write(codec.dumps(i._data) + b'\n')
 
     def geojson(self, id='STAC', description='Single file STAC'):
         """ Get Items as GeoJSON FeatureCollection """
@@ -144,20 +355,38 @@ class ItemCollection(object):
             'stac_version': STAC_VERSION,
             'stac_extensions': ['single-file-stac'],
             'type': 'FeatureCollection',
-            'features': features,
+            # collections first so streaming readers can link items to them
             'collections': [c._data for c in self._collections],
+            'features': features,
             'links': []
         }
         return geoj
 
+    def query(self, query=None, ids=None):
+        """ Get new ItemCollection of Items matching all predicates in query
+
+        query is a Query or a dictionary of property name to value or to a dictionary of
+        operator to value (see Query), and ids an optional list of Item ids to match.
+        Pass a Query to inspect how many candidates each predicate eliminated.
+        """
+        if not isinstance(query, Query):
+            query = Query(query, ids=ids)
+        elif ids is not None:
+            raise ValueError('Provide ids in the Query')
+        items = self.select(query.positions(self.table()))
+        logger.debug('Query %s matched %s of %s items' % (query, len(items), len(self)))
+        return items
+
     def filter(self, key, values):
-        """ Filter scenes on key matching value """
-        items = []
-        for val in values:
-            items += list(filter(lambda x: x[key] == val, self._items))
-        self._items = items
+        """ Filter scenes on key matching value (in place, see query() for a non-mutating version) """
+        table = self.table()
+        self._table = table.subset(table.positions(key, values))
+        self._items = self._table._items
 
-    def download_assets(self, *args, **kwargs):
+    def download_assets(self, *args, workers=None, **kwargs):
+        """ Download multiple assets from all Items, concurrently on `workers` threads if provided """
+        if workers:
+            return self.download_results(*args, workers=workers, **kwargs)[1]
         filenames = []
         for i in self._items:
             fnames = i.download_assets(*args, **kwargs)
@@ -165,6 +394,16 @@ class ItemCollection(object):
                 filenames.append(fnames)
         return filenames
 
+    def download_results(self, keys=None, workers=4, host_connections=None, progress=None, **kwargs):
+        """ Download assets concurrently, returning (list of DownloadResults, filenames per Item) """
+        manager = DownloadManager(workers=workers, host_connections=host_connections, progress=progress)
+        results = manager.download_assets(self._items, keys=keys, **kwargs)
+        # results are in Item order
+        filenames = {}
+        for r in results:
+            filenames.setdefault(id(r.item), []).append(r.path if r.error is None else None)
+        return results, list(filenames.values())
+
     def download(self, *args, **kwargs):
         """ Download all Items """
         dls = []
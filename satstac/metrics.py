@@ -0,0 +1,166 @@
+import bisect
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# upper bounds (seconds) of latency histogram buckets, a last bucket counts anything slower
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def labels(url):
+    """ Get (scheme, host) of a filename or URL, local files are ('file', '') """
+    if url is None or '://' not in url:
+        return 'file', ''
+    # cheaper than urlparse, this is called for every operation
+    scheme, _, rest = url.partition('://')
+    return scheme.lower() or 'file', rest.split('/', 1)[0]
+
+
+class Timer(object):
+    """ Context manager recording the time taken by a block, see Metrics.timer """
+
+    def __init__(self, metrics, operation, url):
+        self.metrics = metrics
+        self.operation = operation
+        self.url = url
+        # set by the block
+        self.event = {'bytes': 0}
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.event
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.metrics.record(self.operation, self.url, time.perf_counter() - self.start,
+                            nbytes=self.event['bytes'], error=exc_type is not None)
+        return False
+
+
+class Metrics(object):
+    """ Counters, bytes and latency histograms of I/O operations by scheme and host
+
+    Operations recorded by sat-stac are open, save, download and presign (of files and URLs)
+    and parse and serialize (of JSON documents). If `callback` is set it is called with a
+    dictionary of every event: operation, scheme, host, seconds, bytes and error.
+    """
+
+    def __init__(self, enabled=True, callback=None):
+        self.enabled = enabled
+        self.callback = callback
+        # (operation, scheme, host): {'count', 'errors', 'bytes', 'seconds', 'histogram'}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation, url, seconds, nbytes=0, error=False):
+        """ Record an operation on url that took seconds and transferred nbytes """
+        if not self.enabled:
+            return
+        scheme, host = labels(url)
+        key = (operation, scheme, host)
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {'count': 0, 'errors': 0, 'bytes': 0, 'seconds': 0.0,
+                                            'histogram': [0] * (len(LATENCY_BUCKETS) + 1)}
+            stats['count'] += 1
+            stats['errors'] += 1 if error else 0
+            stats['bytes'] += nbytes
+            stats['seconds'] += seconds
+            stats['histogram'][bucket] += 1
+        if self.callback is not None:
+            event = {'operation': operation, 'scheme': scheme, 'host': host, 'seconds': seconds,
+                     'bytes': nbytes, 'error': error}
+            try:
+                self.callback(event)
+            except Exception as err:
+                logger.warning('Metrics callback failed: %s' % err)
+
+    def timer(self, operation, url):
+        """ Context manager recording the time taken by the block as an operation on url
+
+        It returns a dictionary in which the block can set 'bytes', and exceptions are
+        recorded as errors
+        """
+        return Timer(self, operation, url)
+
+    def timed_chunks(self, operation, url, chunks):
+        """ Generator of byte chunks from chunks, recorded as one operation on url
+
+        Only time spent getting chunks counts, not time spent by the consumer between them.
+        It is recorded when chunks are exhausted or fail (as an error), or the consumer stops.
+        """
+        chunks = iter(chunks)
+        seconds, nbytes, error = 0.0, 0, False
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    return
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    seconds += time.perf_counter() - start
+                nbytes += len(chunk)
+                yield chunk
+        finally:
+            self.record(operation, url, seconds, nbytes=nbytes, error=error)
+
+    def snapshot(self):
+        """ Get list of statistics of each operation, scheme and host recorded so far
+
+        Each is a dictionary of operation, scheme, host, count, errors, bytes, seconds (total),
+        and histogram, a list of [upper bound in seconds (None for the last bucket), count]
+        """
+        with self._lock:
+            stats = [(key, dict(s, histogram=list(s['histogram']))) for key, s in self._stats.items()]
+        out = []
+        for (operation, scheme, host), s in sorted(stats, key=lambda s: s[0]):
+            s['histogram'] = [[bound, n] for bound, n in zip(LATENCY_BUCKETS + (None,), s['histogram'])]
+            out.append(dict(operation=operation, scheme=scheme, host=host, **s))
+        return out
+
+    def reset(self):
+        """ Clear all statistics """
+        with self._lock:
+            self._stats.clear()
+
+
+# shared registry used by sat-stac, set SATSTAC_METRICS=0 to disable
+registry = Metrics(enabled=os.getenv('SATSTAC_METRICS', '1') != '0')
+
+
+def record(operation, url, seconds, nbytes=0, error=False):
+    """ Record an operation in the shared registry, see Metrics.record """
+    registry.record(operation, url, seconds, nbytes=nbytes, error=error)
+
+
+def timer(operation, url):
+    """ Time a block as an operation in the shared registry, see Metrics.timer """
+    return registry.timer(operation, url)
+
+
+def timed_chunks(operation, url, chunks):
+    """ Record reading chunks as an operation in the shared registry, see Metrics.timed_chunks """
+    return registry.timed_chunks(operation, url, chunks)
+
+
+def snapshot():
+    """ Get statistics of the shared registry, see Metrics.snapshot """
+    return registry.snapshot()
+
+
+def reset():
+    """ Clear statistics of the shared registry """
+    registry.reset()
+
+
+def set_callback(callback):
+    """ Call callback with every event recorded in the shared registry (None to stop) """
+    registry.callback = callback
@@ -0,0 +1,132 @@
+import logging
+import operator
+
+from .index import utc
+
+logger = logging.getLogger(__name__)
+
+# comparison operators, as in the STAC API query extension
+COMPARISONS = {
+    'neq': operator.ne,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'gt': operator.gt,
+    'gte': operator.ge,
+}
+
+OPERATORS = ['eq', 'in', 'exists'] + list(COMPARISONS.keys())
+
+
+class Query(object):
+    """ Conjunction of predicates on Item properties
+
+    Predicates are given as a dictionary of property name to either a value (equality)
+    or a dictionary of operator to value, e.g. {'eo:cloud_cover': {'lte': 10}}, with
+    operators eq, neq, lt, lte, gt, gte, in and exists. Equality, membership, id and
+    datetime range predicates are answered from the hashed and sorted indexes of a
+    PropertyTable, the remaining predicates are then tested in a single pass over the
+    candidate Items.
+    """
+
+    def __init__(self, query=None, ids=None):
+        # [(key, op, value)]
+        self.predicates = []
+        for key, spec in (query or {}).items():
+            if not isinstance(spec, dict):
+                spec = {'eq': spec}
+            for op, val in spec.items():
+                if op not in OPERATORS:
+                    raise ValueError('Unknown query operator %s' % op)
+                if op == 'in':
+                    val = list(val)
+                self.predicates.append((key, op, val))
+        self.ids = None if ids is None else list(ids)
+        # [{'predicate', 'candidates', 'eliminated'}] from the last evaluation
+        self.stats = []
+
+    def __repr__(self):
+        preds = ['%s %s %s' % p for p in self.predicates]
+        if self.ids is not None:
+            preds.insert(0, 'id in %s ids' % len(self.ids))
+        return ' and '.join(preds) if preds else 'all'
+
+    def _record(self, predicate, before, after):
+        self.stats.append({'predicate': predicate, 'candidates': before, 'eliminated': before - after})
+
+    def positions(self, table):
+        """ Get sorted positions of Items in PropertyTable table matching all predicates """
+        self.stats = []
+        # predicates answered from indexes, as (description, positions)
+        indexed = []
+        scanned = []
+        ranges = {}
+        if self.ids is not None:
+            indexed.append(('id in %s ids' % len(self.ids), table.positions('id', self.ids)))
+        for key, op, val in self.predicates:
+            if op == 'eq':
+                indexed.append(('%s eq %s' % (key, val), table.positions(key, [val])))
+            elif op == 'in':
+                indexed.append(('%s in %s' % (key, val), table.positions(key, val)))
+            elif key == 'datetime' and op in ['lt', 'lte', 'gt', 'gte']:
+                ranges[op] = val
+            else:
+                scanned.append((key, op, val))
+        if ranges:
+            positions = table.time_index().between(ranges.get('gte', ranges.get('gt')),
+                                                   ranges.get('lte', ranges.get('lt')))
+            indexed.append(('datetime in [%s, %s]' % (ranges.get('gte', ranges.get('gt')),
+                            ranges.get('lte', ranges.get('lt'))), positions))
+            # open bounds are checked when scanning
+            for op in ['gt', 'lt']:
+                if op in ranges:
+                    scanned.append(('datetime', op, ranges[op]))
+
+        # intersect most selective first
+        candidates = None
+        for desc, positions in sorted(indexed, key=lambda i: len(i[1])):
+            before = len(table) if candidates is None else len(candidates)
+            candidates = set(positions) if candidates is None else candidates.intersection(positions)
+            self._record(desc, before, len(candidates))
+        candidates = range(len(table)) if candidates is None else sorted(candidates)
+
+        if scanned:
+            tests = [self._test(table, *pred) for pred in scanned]
+            eliminated = [0] * len(tests)
+            before = len(candidates)
+            matches = []
+            for pos in candidates:
+                for i, test in enumerate(tests):
+                    if not test(pos):
+                        eliminated[i] += 1
+                        break
+                else:
+                    matches.append(pos)
+            for pred, n in zip(scanned, eliminated):
+                self._record('%s %s %s' % pred, before, before - n)
+                before -= n
+            candidates = matches
+        return list(candidates)
+
+    def _test(self, table, key, op, val):
+        """ Get function testing if the Item at a position matches a scanned predicate """
+        column = table.column(key)
+        if op == 'exists':
+            return lambda pos: (column[pos] is not None) == bool(val)
+        if key == 'datetime':
+            column = table.time_index()._datetimes
+            val = utc(val)
+        compare = COMPARISONS[op]
+
+        def test(pos):
+            try:
+                return column[pos] is not None and compare(column[pos], val)
+            except TypeError:
+                return False
+        return test
+
+    def summary(self):
+        """ Get text summary of candidates eliminated by each predicate in the last evaluation """
+        lines = ['{:<50} {:>12} {:>12}'.format('Predicate', 'Candidates', 'Eliminated')]
+        for s in self.stats:
+            lines.append('{:<50} {:>12} {:>12}'.format(s['predicate'], s['candidates'], s['eliminated']))
+        return '\n'.join(lines)
@@ -0,0 +1,97 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# default settings for the shared session, change with configure()
+DEFAULTS = {
+    # number of per-host connection pools to keep
+    'pool_connections': 10,
+    # number of keep-alive connections per host
+    'pool_maxsize': 10,
+    # (connect, read) timeout in seconds applied when a request does not give one
+    'timeout': (10, 60),
+    'max_retries': 0,
+}
+
+_config = dict(DEFAULTS)
+# host -> pool_maxsize for hosts that need a different pool size
+_hosts = {}
+_session = None
+_lock = threading.Lock()
+
+
+def configure(hosts=None, **kwargs):
+    """ Configure the shared session, any open connections are closed
+
+    Keywords match DEFAULTS, `hosts` is a dictionary of hostname to pool size for
+    hosts (e.g., a busy S3 bucket) that need a larger pool than `pool_maxsize`.
+    """
+    global _session
+    for key in kwargs:
+        if key not in DEFAULTS:
+            raise ValueError('Unknown session setting %s' % key)
+    with _lock:
+        _config.update(kwargs)
+        if hosts is not None:
+            _hosts.clear()
+            _hosts.update(hosts)
+        if _session is not None:
+            _session.close()
+            _session = None
+    return dict(_config, hosts=dict(_hosts))
+
+
+def reset():
+    """ Restore default settings and close the shared session """
+    with _lock:
+        _config.clear()
+        _config.update(DEFAULTS)
+        _hosts.clear()
+    return configure()
+
+
+def _adapter(pool_maxsize):
+    # requests is imported on first use as it is slow to import
+    from requests.adapters import HTTPAdapter
+    return HTTPAdapter(pool_connections=_config['pool_connections'], pool_maxsize=pool_maxsize,
+                       max_retries=_config['max_retries'])
+
+
+def get_session():
+    """ Get the shared requests Session, creating it on first use """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                session = requests.Session()
+                session.mount('https://', _adapter(_config['pool_maxsize']))
+                session.mount('http://', _adapter(_config['pool_maxsize']))
+                for host, size in _hosts.items():
+                    session.mount('https://%s/' % host, _adapter(size))
+                    session.mount('http://%s/' % host, _adapter(size))
+                logger.debug('Created HTTP session with %s' % _config)
+                _session = session
+    return _session
+
+
+def request(method, url, **kwargs):
+    """ Send a request on the shared session, using the default timeout if not given """
+    kwargs.setdefault('timeout', _config['timeout'])
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    """ GET url on the shared session """
+    return request('GET', url, **kwargs)
+
+
+def put(url, **kwargs):
+    """ PUT url on the shared session """
+    return request('PUT', url, **kwargs)
+
+
+def head(url, **kwargs):
+    """ HEAD url on the shared session """
+    return request('HEAD', url, **kwargs)
@@ -0,0 +1,378 @@
+import itertools
+import logging
+import os
+import posixpath
+import threading
+import time
+
+from urllib.parse import urljoin, urlparse
+
+from . import session
+from .cache import file_validator, http_validator
+from .utils import mkdirp, get_s3_signed_url
+
+logger = logging.getLogger(__name__)
+
+# bytes read at a time by Storage.iter_chunks
+CHUNK_SIZE = 1024 * 1024
+
+
+class Storage(object):
+    """ Base class of storage backends
+
+    A backend reads and writes whole files as bytes, addressed by filename or URL.
+    Failures raise OSError: FileNotFoundError if a file does not exist.
+    """
+
+    def key(self, url):
+        """ Get key identifying url, e.g., for caching """
+        return url
+
+    def fetch(self, url, validator=None):
+        """ Get (contents, validator) of url, contents are None if the file still matches validator
+
+        The validator identifies a version of the file (None if it cannot be validated)
+        """
+        return self.read(url), None
+
+    def read(self, url):
+        """ Get contents of url as bytes """
+        raise NotImplementedError()
+
+    def iter_chunks(self, url, chunk_size=CHUNK_SIZE):
+        """ Generator of byte chunks of url """
+        data = self.read(url)
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i+chunk_size]
+
+    def write(self, url, data):
+        """ Write bytes to url, returning the validator of the new file (None if not known) """
+        raise NotImplementedError()
+
+    def exists(self, url):
+        """ Check if url exists """
+        try:
+            self.stat(url)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def list(self, url):
+        """ Get sorted list of files under url """
+        raise NotImplementedError('Listing is not supported for %s' % url)
+
+    def stat(self, url):
+        """ Get dictionary of size (bytes) and mtime (seconds since epoch, None if not known) of url """
+        raise NotImplementedError()
+
+
+class LocalStorage(Storage):
+    """ Local filesystem
+
+    If `root` is given URLs are mapped to files below it (scheme://host/path to root/host/path),
+    e.g., as a stand-in for S3 in tests.
+    """
+
+    def __init__(self, root=None):
+        self.root = root
+
+    def path(self, url):
+        """ Get local filename of url """
+        if self.root is not None:
+            parts = urlparse(url)
+            return os.path.join(self.root, parts.netloc, parts.path.lstrip('/'))
+        if url[0:7] == 'file://':
+            return url[7:]
+        return url
+
+    def key(self, url):
+        return os.path.abspath(self.path(url))
+
+    def fetch(self, url, validator=None):
+        fname = self.path(url)
+        try:
+            stat = os.stat(fname)
+        except OSError:
+            raise FileNotFoundError('%s does not exist locally' % url)
+        _validator = file_validator(stat)
+        if validator is not None and validator == _validator:
+            return None, validator
+        with open(fname, 'rb') as f:
+            return f.read(), _validator
+
+    def read(self, url):
+        return self.fetch(url)[0]
+
+    def iter_chunks(self, url, chunk_size=CHUNK_SIZE):
+        fname = self.path(url)
+        if not os.path.exists(fname):
+            raise FileNotFoundError('%s does not exist locally' % url)
+        with open(fname, 'rb') as f:
+            yield from iter(lambda: f.read(chunk_size), b'')
+
+    def write(self, url, data):
+        """ Write to a temporary file that is renamed over the target, so readers never see partial files """
+        fname = self.path(url)
+        mkdirp(os.path.dirname(fname))
+        tmp = '%s.%s-%s.tmp' % (fname, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, fname)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return file_validator(os.stat(fname))
+
+    def exists(self, url):
+        return os.path.exists(self.path(url))
+
+    def list(self, url):
+        path = self.path(url)
+        fnames = []
+        for root, dirs, files in os.walk(path):
+            fnames += [os.path.join(root, f) for f in files]
+        if self.root is not None:
+            # back to URLs
+            fnames = [url.rstrip('/') + '/' + os.path.relpath(f, path).replace(os.sep, '/') for f in fnames]
+        return sorted(fnames)
+
+    def stat(self, url):
+        try:
+            stat = os.stat(self.path(url))
+        except OSError:
+            raise FileNotFoundError('%s does not exist locally' % url)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+class HTTPStorage(Storage):
+    """ HTTP(S) server, read with conditional requests on the shared session """
+
+    def _get(self, url, headers={}, stream=False):
+        return session.get(url, headers=headers, stream=stream)
+
+    def _head(self, url):
+        return session.head(url, allow_redirects=True)
+
+    def fetch(self, url, validator=None):
+        headers = {}
+        if validator is not None:
+            etag, modified = validator
+            if etag is not None:
+                headers['If-None-Match'] = etag
+            if modified is not None:
+                headers['If-Modified-Since'] = modified
+        resp = self._get(url, headers=headers)
+        if resp.status_code == 304 and validator is not None:
+            return None, validator
+        elif resp.status_code == 404:
+            raise FileNotFoundError('Unable to open %s' % url)
+        elif resp.status_code != 200:
+            raise IOError('Unable to open %s' % url)
+        return resp.content, http_validator(resp.headers)
+
+    def read(self, url):
+        return self.fetch(url)[0]
+
+    def iter_chunks(self, url, chunk_size=CHUNK_SIZE):
+        resp = self._get(url, stream=True)
+        if resp.status_code != 200:
+            resp.close()
+            raise IOError('Unable to open %s' % url)
+        with resp:
+            yield from resp.iter_content(chunk_size=chunk_size)
+
+    def write(self, url, data):
+        resp = session.put(url, data=data, headers={'content-type': 'application/json'})
+        if resp.status_code not in [200, 201, 204]:
+            raise IOError('Unable to save file to %s: %s' % (url, resp.text))
+        return None
+
+    def stat(self, url):
+        resp = self._head(url)
+        if resp.status_code == 404:
+            raise FileNotFoundError('%s does not exist' % url)
+        elif resp.status_code != 200:
+            raise IOError('Unable to stat %s: %s' % (url, resp.status_code))
+        from email.utils import parsedate_to_datetime
+        size = resp.headers.get('Content-Length')
+        modified = resp.headers.get('Last-Modified')
+        return {
+            'size': int(size) if size is not None else None,
+            'mtime': parsedate_to_datetime(modified).timestamp() if modified is not None else None
+        }
+
+
+S3_NAMESPACE = '{http://s3.amazonaws.com/doc/2006-03-01/}'
+
+
+class S3Storage(HTTPStorage):
+    """ AWS S3, as s3://bucket/key or https://bucket.s3.amazonaws.com/key URLs
+
+    Requests are sent unsigned first (for public buckets) and signed with the credentials
+    in the environment if that fails. Written files are public-read if `public`.
+    """
+
+    def __init__(self, public=True):
+        self.public = public
+
+    def _https(self, url):
+        """ Get https URL of an s3:// URL """
+        if url[0:5] == 's3://':
+            bucket, key = (url[5:].split('/', 1) + [''])[0:2]
+            return 'https://%s.s3.amazonaws.com/%s' % (bucket, key)
+        return url
+
+    def _get(self, url, headers={}, stream=False):
+        url = self._https(url)
+        resp = session.get(url, headers=headers, stream=stream)
+        if resp.status_code in [200, 304]:
+            return resp
+        resp.close()
+        # try signed URL
+        signed_url, signed_headers = get_s3_signed_url(url)
+        return session.get(signed_url, headers=dict(headers, **(signed_headers or {})), stream=stream)
+
+    def _head(self, url):
+        url = self._https(url)
+        resp = session.head(url)
+        if resp.status_code == 200:
+            return resp
+        signed_url, signed_headers = get_s3_signed_url(url, rtype='HEAD')
+        return session.head(signed_url, headers=signed_headers)
+
+    def write(self, url, data):
+        # use signed URL
+        signed_url, signed_headers = get_s3_signed_url(self._https(url), rtype='PUT', public=self.public,
+                                                       content_type='application/json')
+        resp = session.put(signed_url, data=data, headers=signed_headers)
+        if resp.status_code != 200:
+            raise IOError('Unable to save file to %s: %s' % (url, resp.text))
+        return None
+
+    def list(self, url):
+        """ Get sorted list of keys starting with the key of url, as URLs of the same form """
+        import xml.etree.ElementTree as ET
+        parts = urlparse(self._https(url))
+        prefix = parts.path.lstrip('/')
+        base = url[:len(url) - len(prefix)].rstrip('/') + '/'
+        params = {'list-type': '2', 'prefix': prefix}
+        keys = []
+        while True:
+            signed_url, headers = get_s3_signed_url('https://%s/' % parts.netloc, params=params)
+            resp = session.get(signed_url, headers=headers)
+            if resp.status_code != 200:
+                raise IOError('Unable to list %s: %s' % (url, resp.text))
+            root = ET.fromstring(resp.content)
+            keys += [el.text for el in root.iter(S3_NAMESPACE + 'Key')]
+            token = root.find(S3_NAMESPACE + 'NextContinuationToken')
+            if root.findtext(S3_NAMESPACE + 'IsTruncated') != 'true' or token is None:
+                break
+            params['continuation-token'] = token.text
+        return sorted(base + k for k in keys)
+
+
+class MemoryStorage(Storage):
+    """ In-memory files, e.g., memory://catalog/catalog.json, for building catalogs without touching disk """
+
+    def __init__(self):
+        # url: (data, version, mtime)
+        self._files = {}
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._files)
+
+    def _get(self, url):
+        try:
+            return self._files[url]
+        except KeyError:
+            raise FileNotFoundError('%s does not exist' % url)
+
+    def fetch(self, url, validator=None):
+        data, version, mtime = self._get(url)
+        if validator is not None and validator == version:
+            return None, version
+        return data, version
+
+    def read(self, url):
+        return self._get(url)[0]
+
+    def write(self, url, data):
+        with self._lock:
+            version = next(self._versions)
+            self._files[url] = (bytes(data), version, time.time())
+        return version
+
+    def exists(self, url):
+        return url in self._files
+
+    def list(self, url):
+        return sorted(k for k in list(self._files.keys()) if k.startswith(url))
+
+    def stat(self, url):
+        data, version, mtime = self._get(url)
+        return {'size': len(data), 'mtime': mtime}
+
+    def remove(self, url=None):
+        """ Remove url, or every file if no url given """
+        with self._lock:
+            if url is None:
+                self._files.clear()
+            else:
+                self._files.pop(url, None)
+
+
+# scheme: backend, '' is local files
+backends = {
+    '': LocalStorage(),
+    'file': LocalStorage(),
+    'http': HTTPStorage(),
+    'https': HTTPStorage(),
+    's3': S3Storage(),
+    'memory': MemoryStorage(),
+}
+
+
+def scheme(url):
+    """ Get storage scheme of url, 's3' for https S3 URLs and '' for local files """
+    if '://' not in url:
+        return ''
+    _scheme = url.split('://', 1)[0].lower()
+    if _scheme == 'https' and urlparse(url).netloc.endswith('s3.amazonaws.com'):
+        return 's3'
+    return _scheme
+
+
+def register(_scheme, backend):
+    """ Use backend for URLs with scheme, returning the backend it replaces (None if none) """
+    previous = backends.get(_scheme)
+    backends[_scheme] = backend
+    return previous
+
+
+def get(url):
+    """ Get storage backend for url """
+    _scheme = scheme(url)
+    if _scheme not in backends:
+        raise ValueError('No storage backend for %s' % url)
+    return backends[_scheme]
+
+
+def key(url):
+    """ Get key identifying url, absolute path for local files """
+    return get(url).key(url)
+
+
+def resolve(base, link):
+    """ Resolve link relative to the file base """
+    if os.path.isabs(link) or '://' in link:
+        return link
+    if base[0:4] == 'http':
+        return urljoin(os.path.dirname(base) + '/', link)
+    if '://' in base:
+        prefix, path = base.split('://', 1)
+        return '%s://%s' % (prefix, posixpath.normpath(posixpath.join(posixpath.dirname(path), link)))
+    return os.path.abspath(os.path.join(os.path.dirname(base), link))
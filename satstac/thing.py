@@ -1,15 +1,17 @@
-import json
 import os
-import requests
 
 from logging import getLogger
-from urllib.parse import urljoin
 from .version import __version__
-from .utils import mkdirp, get_s3_signed_url
+from . import codec, metrics, session, storage, transaction
+from .cache import documents
+from .compression import compress, decompress, detect
 
 
 logger = getLogger(__name__)
 
+# documents with fewer links than this (e.g., Items) are scanned instead of indexed
+LINK_INDEX_SIZE = 64
+
 
 class STACError(Exception):
     pass
@@ -17,10 +19,14 @@ class STACError(Exception):
 
 class Thing(object):
 
+    # no per-instance __dict__, Items of large collections carry only these references
+    __slots__ = ('filename', '_data', '_link_index')
+
     def __init__(self, data, filename=None):
         """ Initialize a new class with a dictionary """
         self.filename = filename
         self._data = data
+        self._link_index = None
         if 'id' not in data:
             raise STACError('ID is required')
         if 'links' not in self._data.keys():
@@ -32,31 +38,53 @@ class Thing(object):
     @classmethod
     def open_remote(self, url, headers={}):
         """ Open remote file """
-        resp = requests.get(url, headers=headers)
-        if resp.status_code == 200:
-            dat = resp.text
-        else:
+        resp = session.get(url, headers=headers)
+        if resp.status_code != 200:
             raise STACError('Unable to open %s' % url)
-        return json.loads(dat)
+        return codec.loads(resp.content)
 
     @classmethod
-    def open(cls, filename):
-        """ Open an existing JSON data file """
+    def open(cls, filename, compression=None):
+        """ Open an existing JSON data file from any storage backend (see satstac.storage)
+
+        Files are decompressed with compression ('gzip' or 'zstd'), by default the
+        compression of the file extension (.gz or .zst)
+        """
         logger.debug('Opening %s' % filename)
-        if filename[0:5] == 'https':
-            try:
-                dat = cls.open_remote(filename)
-            except STACError as err:
-                # try signed URL
-                url, headers = get_s3_signed_url(filename)
-                dat = cls.open_remote(url, headers)
+        tx = transaction.active()
+        pending = tx.pending(filename) if tx is not None else None
+        if pending is not None:
+            # unsaved changes in the current Transaction
+            if isinstance(pending, cls):
+                return pending
+            return cls(pending._data, filename=filename)
+        return cls(cls._open_cached(filename, compression=compression), filename=filename)
+
+    @classmethod
+    def _open_cached(cls, filename, compression=None):
+        """ Read and parse filename, unless a cached copy is still valid """
+        store = storage.get(filename)
+        key = store.key(filename)
+        try:
+            with metrics.timer('open', filename) as event:
+                dat, validator = store.fetch(filename, validator=documents.validator(key))
+                event['bytes'] = len(dat) if dat is not None else 0
+            cached = documents.get(key, validator)
+            if cached is None and dat is None:
+                # cached copy evicted since it was validated
+                with metrics.timer('open', filename) as event:
+                    dat, validator = store.fetch(filename)
+                    event['bytes'] = len(dat)
+        except OSError as err:
+            raise STACError(str(err))
+        if cached is None:
+            dat = decompress(dat, compression or detect(filename))
+            documents.put(key, validator, dat)
         else:
-            if os.path.exists(filename):
-                dat = open(filename).read()
-                dat = json.loads(dat)
-            else:
-                raise STACError('%s does not exist locally' % filename)
-        return cls(dat, filename=filename)
+            dat = cached
+        with metrics.timer('parse', filename) as event:
+            event['bytes'] = len(dat)
+            return codec.loads(dat)
 
     def __getitem__(self, key):
         """ Get key from properties """
@@ -73,27 +101,48 @@ class Thing(object):
         """ Return path to this catalog file (None if no filename set) """
         return os.path.dirname(self.filename) if self.filename else None
 
-    def links(self, rel=None):
-        """ Get links for specific rel type """
+    def _links_by(self):
+        """ Get index of links, rebuilt if the links list was replaced or changed size
+
+        The index is a dictionary of 'keys': {(rel, href): link}, 'rels': {rel: [links]}
+        and 'resolved': {rel: (filename, [hrefs])} caching the output of links(). It is
+        None for documents with fewer than LINK_INDEX_SIZE links.
+        """
         links = self._data.get('links', [])
-        if rel is not None:
-            links = [l for l in links if l.get('rel') == rel]
-        links = [l['href'] for l in links]
-        if self.filename is not None:
-            _links = []
+        if len(links) < LINK_INDEX_SIZE:
+            self._link_index = None
+            return None
+        index = self._link_index
+        if index is None or index['links'] is not links or index['size'] != len(links):
+            index = {'links': links, 'size': len(links), 'keys': {}, 'rels': {None: links}, 'resolved': {}}
             for l in links:
-                if os.path.isabs(l) or l[0:4] == 'http':
-                    # if absolute or https 
-                    link = l
-                else:
-                    # relative path
-                    if self.filename[0:4] == 'http':
-                        link = urljoin(os.path.dirname(self.filename) + '/', l)
-                    else: 
-                        link = os.path.abspath(os.path.join(os.path.dirname(self.filename), l))
-                _links.append(link)
-            links = _links
-        return links
+                index['keys'].setdefault((l.get('rel'), l['href']), l)
+                if l.get('rel') is not None:
+                    index['rels'].setdefault(l['rel'], []).append(l)
+            self._link_index = index
+        return index
+
+    def _resolve_link(self, link):
+        """ Resolve link href relative to this file """
+        if self.filename is None:
+            return link
+        return storage.resolve(self.filename, link)
+
+    def links(self, rel=None):
+        """ Get links for specific rel type """
+        index = self._links_by()
+        if index is None:
+            return [self._resolve_link(l['href']) for l in self._data.get('links', [])
+                    if rel is None or l.get('rel') == rel]
+        links = index['rels'].get(rel, [])
+        filename, hrefs = index['resolved'].get(rel, (self.filename, []))
+        if filename != self.filename:
+            hrefs = []
+        if len(hrefs) < len(links):
+            # resolve only links added since the last call
+            hrefs = hrefs + [self._resolve_link(l['href']) for l in links[len(hrefs):]]
+            index['resolved'][rel] = (self.filename, hrefs)
+        return list(hrefs)
 
     def root(self):
         """ Get root link """
@@ -118,16 +167,26 @@ class Thing(object):
 
     def add_link(self, rel, link, type=None, title=None):
         """ Add a new link """
+        links = self._data['links']
+        index = self._links_by()
         # if this link already exists do not add it
-        for l in self._data['links']:
-            if l['rel'] == rel and l['href'] == link:
+        if index is None:
+            if any(l.get('rel') == rel and l['href'] == link for l in links):
                 return
+        elif (rel, link) in index['keys']:
+            return
         l = {'rel': rel, 'href': link}
         if type is not None:
             l['type'] = type
         if title is not None:
             l['title'] = title
-        self._data['links'].append(l)
+        links.append(l)
+        if index is None:
+            return
+        index['size'] += 1
+        index['keys'][(rel, link)] = l
+        if rel is not None:
+            index['rels'].setdefault(rel, []).append(l)
 
 
     def clean_hierarchy(self):
@@ -138,25 +197,41 @@ class Thing(object):
             if l['rel'] not in rels:
                 links.append(l)
         self._data['links'] = links
+        self._link_index = None
 
-    def save(self, filename=None):
-        """ Write a catalog file """
+    def save(self, filename=None, compression=None):
+        """ Write a catalog file (deferred until commit within a Transaction)
+
+        The file is compressed with compression ('gzip' or 'zstd'), by default the
+        compression of the file extension (.gz or .zst)
+        """
         if filename is not None:
             self.filename = filename
         if self.filename is None:
             raise STACError('No filename provided, specify with filename keyword')
-        logger.debug('Saving %s as %s' % (self.id, self.filename))
-        fname = self.filename
-        if self.filename[0:5] == 'https':
-            # use signed URL
-            signed_url, signed_headers = get_s3_signed_url(self.filename, rtype='PUT',
-                                                           public=True, content_type='application/json')
-            resp = requests.put(signed_url, data=json.dumps(self._data), headers=signed_headers)
-            if resp.status_code != 200:
-                raise STACError('Unable to save file to %s: %s' % (self.filename, resp.text))
+        tx = transaction.active()
+        if tx is not None:
+            tx.add(self, compression=compression)
+        else:
+            self._write(self.filename, compression=compression)
+        return self
+
+    def _write(self, fname, compression=None):
+        """ Write to fname now, with the storage backend for fname """
+        logger.debug('Saving %s as %s' % (self.id, fname))
+        store = storage.get(fname)
+        with metrics.timer('serialize', fname) as event:
+            raw = codec.dumps(self._data)
+            data = compress(raw, compression or detect(fname))
+            event['bytes'] = len(data)
+        try:
+            with metrics.timer('save', fname) as event:
+                event['bytes'] = len(data)
+                validator = store.write(fname, data)
+        except OSError as err:
+            raise STACError(str(err))
+        key = store.key(fname)
+        if validator is None:
+            documents.invalidate(key)
         else:
-            # local file save
-            mkdirp(os.path.dirname(fname))
-            with open(fname, 'w') as f:
-                f.write(json.dumps(self._data))
-        return self
\ No newline at end of file
+            documents.put(key, validator, raw)
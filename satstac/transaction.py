@@ -0,0 +1,97 @@
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import storage
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def _stack():
+    """ Get the stack of open Transactions of this thread """
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def active():
+    """ Get the innermost open Transaction of this thread (None if there is none) """
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def join(tx):
+    """ Make tx (if not None) the active Transaction of this thread
+
+    Used as initializer of worker threads, so they see the unsaved files of the
+    Transaction of the thread that started them
+    """
+    if tx is not None:
+        _stack().append(tx)
+
+
+def key(filename):
+    """ Key identifying a file, absolute path for local files """
+    return storage.key(filename)
+
+
+class Transaction(object):
+    """ Write-behind session for building catalogs
+
+    Within a `with Transaction():` block Thing.save() only marks a Thing as dirty,
+    and Thing.open() of a dirty file returns the in-memory Thing. On leaving the block
+    each dirty file is written once, on up to `workers` threads. If the block raises
+    nothing is written.
+    """
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        # key: (Thing, filename, compression)
+        self._dirty = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        _stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        _stack().remove(self)
+        if exc_type is None:
+            self.commit()
+        else:
+            logger.warning('Discarding %s unsaved files' % len(self._dirty))
+            self.rollback()
+        return False
+
+    def __len__(self):
+        return len(self._dirty)
+
+    def add(self, thing, compression=None):
+        """ Mark thing as dirty, to be written to thing.filename on commit """
+        with self._lock:
+            self._dirty[key(thing.filename)] = (thing, thing.filename, compression)
+
+    def pending(self, filename):
+        """ Get dirty Thing for filename (None if not dirty) """
+        entry = self._dirty.get(key(filename))
+        return entry[0] if entry is not None else None
+
+    def commit(self):
+        """ Write all dirty files, returning number of files written """
+        with self._lock:
+            dirty = list(self._dirty.values())
+            self._dirty = {}
+        if len(dirty) == 0:
+            return 0
+        logger.debug('Writing %s files' % len(dirty))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(lambda d: d[0]._write(d[1], compression=d[2]), dirty))
+        return len(dirty)
+
+    def rollback(self):
+        """ Discard all dirty files """
+        with self._lock:
+            self._dirty = {}
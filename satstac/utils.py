@@ -1,15 +1,19 @@
 import base64
-import calendar
 import datetime
-import hashlib
-import hmac
+import functools
+import json
 import logging
 import os
-import requests
+import re
 import sys
 import time
 
+from collections import deque
 from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import quote
+
+from . import metrics, session
 
 logger = logging.getLogger(__name__)
 
@@ -53,36 +57,346 @@ def dict_merge(dct, merge_dct, add_keys=True):
     return dct
 
 
-def download_file(url, filename=None, requester_pays=False, headers={}):
-    """ Download a file as filename """
-    filename = os.path.basename(url) if filename is None else filename
-    logger.info('Downloading %s as %s' % (url, filename))
-    _path = os.path.dirname(filename)
-    if not os.path.exists(_path):
-        mkdirp(_path)
+# bytes read at a time when downloading files
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# size of parts fetched in parallel by download_file with connections > 1
+DOWNLOAD_PART_SIZE = 64 * 1024 * 1024
+
+
+def _download_request(url, requester_pays=False, headers={}):
+    """ Send streaming GET request for a download, signing S3 URLs if credentials are available """
     # check if on s3, if so try to sign it
     if 's3.amazonaws.com' in url:
         signed_url, signed_headers = get_s3_signed_url(url, requester_pays=requester_pays)
-        resp = requests.get(signed_url, headers=signed_headers, stream=True)
-        if resp.status_code != 200:
-            resp = requests.get(url, headers=headers, stream=True)
+        signed_headers = dict(headers, **(signed_headers or {}))
+        resp = session.get(signed_url, headers=signed_headers, stream=True)
+        if resp.status_code not in [200, 206, 304]:
+            resp.close()
+            resp = session.get(url, headers=headers, stream=True)
     elif 'eosdis.nasa.gov' in url:
         url = url.replace('/archive/', '/api/v2/content/archives/')
-        resp = requests.get(url, headers=headers, stream=True)
+        resp = session.get(url, headers=headers, stream=True)
     else:
-        resp = requests.get(url, headers=headers, stream=True)
-    if resp.status_code != 200:
-        raise Exception("Unable to download file %s: %s" % (url, resp.text))
-    with open(filename, 'wb') as f:
-        for chunk in resp.iter_content(chunk_size=1024):
+        resp = session.get(url, headers=headers, stream=True)
+    return resp
+
+
+def download_metadata(filename):
+    """ Get metadata (url, etag, last_modified, size) saved alongside a downloaded file """
+    try:
+        with open(filename + '.download.json') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_download_metadata(filename, url, resp, size):
+    """ Save ETag and Last-Modified of a download alongside the file """
+    meta = {
+        'url': url,
+        'etag': resp.headers.get('ETag'),
+        'last_modified': resp.headers.get('Last-Modified'),
+        'size': size
+    }
+    with open(filename + '.download.json', 'w') as f:
+        f.write(json.dumps(meta))
+    return meta
+
+
+def _write_response(resp, filename, offset=None, chunk_size=DOWNLOAD_CHUNK_SIZE, mode='wb'):
+    """ Write body of a streamed response to filename, at offset into an existing file if given """
+    if offset is not None:
+        mode = 'r+b'
+    with open(filename, mode) as f:
+        if offset is not None:
+            f.seek(offset)
+        for chunk in resp.iter_content(chunk_size=chunk_size):
             if chunk:  # filter out keep-alive new chunks
                 f.write(chunk)
+
+
+def _download_parts(resp, url, filename, size, requester_pays=False, headers={}, connections=4,
+                    part_size=DOWNLOAD_PART_SIZE, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """ Finish a download of size bytes whose first part is in resp, fetching the rest in parallel """
+    tmp = filename + '.parts'
+    with open(tmp, 'wb') as f:
+        f.truncate(size)
+    validator = resp.headers.get('ETag') or resp.headers.get('Last-Modified')
+
+    def fetch(start):
+        end = min(start + part_size, size) - 1
+        _headers = dict(headers, Range='bytes=%s-%s' % (start, end))
+        if validator is not None:
+            _headers['If-Range'] = validator
+        with _download_request(url, requester_pays=requester_pays, headers=_headers) as _resp:
+            if _resp.status_code != 206:
+                raise Exception('Unable to download bytes %s-%s of %s: %s' % (start, end, url, _resp.status_code))
+            _write_response(_resp, tmp, offset=start, chunk_size=chunk_size)
+
+    try:
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [executor.submit(fetch, start) for start in range(part_size, size, part_size)]
+            _write_response(resp, tmp, offset=0, chunk_size=chunk_size)
+            for f in futures:
+                f.result()
+    except Exception:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, filename)
     return filename
 
+
+def download_file(url, filename=None, requester_pays=False, headers={}, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                  resume=True, connections=1, part_size=DOWNLOAD_PART_SIZE):
+    """ Download a file as filename
+
+    The file is written to filename.part and renamed when complete. The ETag and Last-Modified
+    headers are saved in filename.download.json so that an existing file is only transferred
+    again if it changed, and (with `resume`) a partial download is continued with a Range request.
+    With `connections` > 1 a file larger than `part_size` is fetched as parts in parallel, falling
+    back to a single stream if the server does not support Range requests.
+    """
+    filename = os.path.basename(url) if filename is None else filename
+    modified = os.stat(filename).st_mtime_ns if os.path.exists(filename) else None
+    with metrics.timer('download', url) as event:
+        _download_file(url, filename, requester_pays=requester_pays, headers=headers, chunk_size=chunk_size,
+                       resume=resume, connections=connections, part_size=part_size)
+        # bytes of the file if it was (re)downloaded
+        if os.stat(filename).st_mtime_ns != modified:
+            event['bytes'] = os.path.getsize(filename)
+    return filename
+
+
+def _download_file(url, filename, requester_pays=False, headers={}, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                   resume=True, connections=1, part_size=DOWNLOAD_PART_SIZE):
+    """ Download a file as filename, see download_file """
+    logger.info('Downloading %s as %s' % (url, filename))
+    _path = os.path.dirname(filename)
+    if not os.path.exists(_path):
+        mkdirp(_path)
+    part = filename + '.part'
+    meta = download_metadata(filename)
+    if meta.get('url') != url:
+        meta = {}
+    validator = meta.get('etag') or meta.get('last_modified')
+    _headers = dict(headers)
+    resuming = False
+    if os.path.exists(filename) and validator is not None:
+        # only transfer if changed
+        if meta.get('etag'):
+            _headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            _headers['If-Modified-Since'] = meta['last_modified']
+    elif resume and os.path.exists(part) and validator is not None:
+        # continue partial download if unchanged
+        _headers['Range'] = 'bytes=%s-' % os.path.getsize(part)
+        _headers['If-Range'] = validator
+        resuming = True
+    ranged = connections > 1 and not resuming
+    if ranged:
+        # request the first part, the response tells if ranges are supported and the total size
+        _headers['Range'] = 'bytes=0-%s' % (part_size - 1)
+    resp = _download_request(url, requester_pays=requester_pays, headers=_headers)
+    with resp:
+        if resp.status_code == 304:
+            logger.info('%s not modified, skipping download' % url)
+            return filename
+        if resp.status_code == 416:
+            # requested range not satisfiable, start over
+            if os.path.exists(part):
+                os.remove(part)
+            return _download_file(url, filename, requester_pays=requester_pays, headers=headers,
+                                  chunk_size=chunk_size, resume=False)
+        if resp.status_code not in [200, 206]:
+            raise Exception("Unable to download file %s: %s" % (url, resp.text))
+        if ranged and resp.status_code == 206:
+            size = resp.headers.get('Content-Range', '*').split('/')[-1]
+            if size == '*':
+                resp.close()
+                return _download_file(url, filename, requester_pays=requester_pays, headers=headers,
+                                      chunk_size=chunk_size, resume=False)
+            _save_download_metadata(filename, url, resp, int(size))
+            return _download_parts(resp, url, filename, int(size), requester_pays=requester_pays, headers=headers,
+                                   connections=connections, part_size=part_size, chunk_size=chunk_size)
+        if resp.status_code == 200:
+            size = int(resp.headers['Content-Length']) if 'Content-Length' in resp.headers else None
+            _save_download_metadata(filename, url, resp, size)
+        else:
+            logger.info('Resuming download of %s from byte %s' % (url, os.path.getsize(part)))
+        _write_response(resp, part, chunk_size=chunk_size, mode='ab' if resp.status_code == 206 else 'wb')
+    os.replace(part, filename)
+    return filename
+
+
+def threaded_map(func, iterable, executor, window=None, ordered=True):
+    """ Generator yielding func(arg) for each arg, evaluated on executor
+
+    At most `window` calls are in flight at a time (defaults to twice the number of
+    executor workers) so arbitrarily long iterables are consumed lazily. If `ordered`
+    results are yielded in input order, otherwise as soon as they complete.
+    """
+    if window is None:
+        window = 2 * executor._max_workers
+    args = iter(iterable)
+    pending = deque()
+    try:
+        for arg in args:
+            pending.append(executor.submit(func, arg))
+            if len(pending) >= window:
+                break
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                _done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [f for f in pending if f in _done]
+                pending = deque([f for f in pending if f not in _done])
+            for f in done:
+                # refill the window before handing back control
+                for arg in args:
+                    pending.append(executor.submit(func, arg))
+                    break
+                yield f.result()
+    finally:
+        # consumer stopped early or a call failed, drop anything not yet started
+        for f in pending:
+            f.cancel()
+
+
+class _StreamEnd(Exception):
+    pass
+
+
+# characters that can continue a JSON number
+NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
+def iter_json_arrays(chunks, keys, minsize=65536):
+    """ Incrementally parse a JSON object from an iterable of text chunks
+
+    Elements of top level arrays named in `keys` are yielded one at a time as (key, element),
+    all other top level values are yielded whole as (key, value). Only the current element
+    and one chunk of text are held in memory at a time.
+
+    This uses the standard library rather than satstac.codec, as it needs to decode a
+    value at an offset of a partial buffer (JSONDecoder.raw_decode).
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    state = {'buf': '', 'pos': 0, 'eof': False}
+
+    def more(size=1):
+        """ Read chunks until at least size more characters are buffered or the stream ends """
+        parts = [state['buf'][state['pos']:]]
+        nread = 0
+        while nread < size:
+            chunk = next(chunks, None)
+            if chunk is None:
+                state['eof'] = True
+                break
+            parts.append(chunk)
+            nread += len(chunk)
+        state['buf'], state['pos'] = ''.join(parts), 0
+
+    def peek():
+        """ Skip whitespace and return next character """
+        while True:
+            buf, pos = state['buf'], state['pos']
+            while pos < len(buf) and buf[pos] in ' \t\n\r':
+                pos += 1
+            state['pos'] = pos
+            if pos < len(buf):
+                return buf[pos]
+            if state['eof']:
+                raise _StreamEnd()
+            more()
+
+    def expect(chars):
+        c = peek()
+        if c not in chars:
+            raise ValueError('Invalid JSON: expected one of %s at "%s"' % (chars, state['buf'][state['pos']:state['pos']+20]))
+        state['pos'] += 1
+        return c
+
+    def value():
+        """ Decode the next complete value, reading more text until it is complete """
+        peek()
+        while True:
+            buf, pos = state['buf'], state['pos']
+            try:
+                val, end = decoder.raw_decode(buf, pos)
+                # a value ending exactly at the end of the buffer may be truncated, and a number
+                # followed by any of its characters was cut at a chunk boundary (e.g., "-2." + "5")
+                truncated = end == len(buf) or (isinstance(val, (int, float)) and buf[end] in NUMBER_CHARS)
+                if not truncated or state['eof']:
+                    state['pos'] = end
+                    return val
+            except ValueError:
+                if state['eof']:
+                    raise
+            # grow the buffer geometrically so large values are not re-parsed too often
+            more(max(minsize, len(buf) - pos))
+
+    try:
+        expect('{')
+        if peek() == '}':
+            return
+        while True:
+            key = value()
+            expect(':')
+            if key in keys and peek() == '[':
+                state['pos'] += 1
+                if peek() != ']':
+                    while True:
+                        yield key, value()
+                        # drop text that has been consumed
+                        if state['pos'] > minsize:
+                            state['buf'], state['pos'] = state['buf'][state['pos']:], 0
+                        if expect(',]') == ']':
+                            break
+                else:
+                    state['pos'] += 1
+            else:
+                yield key, value()
+            if expect(',}') == '}':
+                break
+    except _StreamEnd:
+        raise ValueError('Invalid JSON: unexpected end of stream')
+
+
+RFC3339 = re.compile(r'^(\d{4}-\d\d-\d\d)[Tt ](\d\d:\d\d:\d\d)(\.\d+)?([Zz]|[+-]\d\d:\d\d)$')
+
+
+def parse_datetime(value):
+    """ Parse a datetime string, using a fast path for RFC 3339 timestamps """
+    m = RFC3339.match(value)
+    if m is None:
+        # dateutil is imported on first use as it is slow to import
+        from dateutil.parser import parse as dateparse
+        return dateparse(value)
+    date, tm, frac, tz = m.groups()
+    frac = (frac[1:] + '000000')[:6] if frac else '000000'
+    tz = '+00:00' if tz in 'Zz' else tz
+    return datetime.datetime.fromisoformat('%sT%s.%s%s' % (date, tm, frac, tz))
+
+
+def parse_datetimes(values):
+    """ Parse a list of datetime strings, parsing each distinct string once """
+    parsed = {}
+    out = []
+    for value in values:
+        dt = parsed.get(value)
+        if dt is None:
+            dt = parsed[value] = parse_datetime(value)
+        out.append(dt)
+    return out
+
+
 def mkdirp(path):
     """ Recursively make directory """
-    if not os.path.isdir(path) and path != '':
-        os.makedirs(path)
+    if path != '':
+        # exist_ok as directories may be created concurrently
+        os.makedirs(path, exist_ok=True)
     return path
 
 
@@ -103,37 +417,78 @@ def splitall(path):
     return allparts
 
 
-def get_s3_signed_url(url, rtype='GET', public=False, requester_pays=False, content_type=None):
-    access_key = os.environ.get('AWS_BUCKET_ACCESS_KEY_ID', os.environ.get('AWS_ACCESS_KEY_ID'))
-    secret_key = os.environ.get('AWS_BUCKET_SECRET_ACCESS_KEY', os.environ.get('AWS_SECRET_ACCESS_KEY'))
-    region = os.environ.get('AWS_BUCKET_REGION', os.environ.get('AWS_REGION', 'eu-central-1'))
+S3_CREDENTIAL_VARS = ['AWS_BUCKET_ACCESS_KEY_ID', 'AWS_ACCESS_KEY_ID', 'AWS_BUCKET_SECRET_ACCESS_KEY',
+                      'AWS_SECRET_ACCESS_KEY', 'AWS_BUCKET_REGION', 'AWS_REGION', 'AWS_SESSION_TOKEN']
+
+
+def s3_credentials():
+    """ Get S3 credentials from the environment as a dictionary (None if not set) """
+    return _s3_credentials(tuple(os.environ.get(v) for v in S3_CREDENTIAL_VARS))
+
+
+@functools.lru_cache(maxsize=8)
+def _s3_credentials(env):
+    """ Resolve credentials from values of S3_CREDENTIAL_VARS, cached for each distinct environment """
+    env = dict(zip(S3_CREDENTIAL_VARS, env))
+    access_key = env['AWS_BUCKET_ACCESS_KEY_ID'] or env['AWS_ACCESS_KEY_ID']
+    secret_key = env['AWS_BUCKET_SECRET_ACCESS_KEY'] or env['AWS_SECRET_ACCESS_KEY']
     if access_key is None or secret_key is None:
-        # if credentials not provided, just try to download without signed URL
-        logger.debug('Not using signed URL for %s' % url)
-        return url, None
+        return None
+    token = env['AWS_SESSION_TOKEN'] if env['AWS_BUCKET_ACCESS_KEY_ID'] is None else None
+    return {
+        'access_key': access_key,
+        'secret_key': secret_key,
+        'region': env['AWS_BUCKET_REGION'] or env['AWS_REGION'] or 'eu-central-1',
+        'token': token
+    }
+
+
+def _hashing():
+    """ Get the (hashlib, hmac) modules used for signing """
+    # imported on first use as loading OpenSSL is slow
+    import hashlib
+    import hmac
+    return hashlib, hmac
+
+
+# Key derivation functions. See:
+# http://docs.aws.amazon.com/general/latest/gr/signature-v4-examples.html#signature-v4-examples-python
+def _sign(key, msg):
+    hashlib, hmac = _hashing()
+    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+
 
+@functools.lru_cache(maxsize=32)
+def get_signature_key(key, dateStamp, regionName, serviceName):
+    """ Derive SigV4 signing key, cached as it only changes daily """
+    kDate = _sign(('AWS4' + key).encode('utf-8'), dateStamp)
+    kRegion = _sign(kDate, regionName)
+    kService = _sign(kRegion, serviceName)
+    kSigning = _sign(kService, 'aws4_request')
+    return kSigning
+
+
+def _s3_parts(url):
+    """ Get (host, key) of an S3 URL """
     parts = url.replace('https://', '').split('/')
     bucket = parts[0].replace('.s3.amazonaws.com', '')
-    key = '/'.join(parts[1:])
+    return '%s.s3.amazonaws.com' % (bucket), '/'.join(parts[1:])
 
-    service = 's3'
-    host = '%s.s3.amazonaws.com' % (bucket)
-    request_parameters = ''
 
-    # Key derivation functions. See:
-    # http://docs.aws.amazon.com/general/latest/gr/signature-v4-examples.html#signature-v4-examples-python
-    def sign(key, msg):
-        return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+def _s3_querystring(params):
+    """ Get canonical query string of a dictionary of parameters """
+    return '&'.join('%s=%s' % (quote(k, safe='~'), quote(params[k], safe='~')) for k in sorted(params))
+
 
-    def getSignatureKey(key, dateStamp, regionName, serviceName):
-        kDate = sign(('AWS4' + key).encode('utf-8'), dateStamp)
-        kRegion = sign(kDate, regionName)
-        kService = sign(kRegion, serviceName)
-        kSigning = sign(kService, 'aws4_request')
-        return kSigning
+def _sign_s3(url, creds, t, rtype='GET', public=False, requester_pays=False, content_type=None, params=None):
+    """ Sign request for S3 url (with query parameters params) with credentials at time t, returning (url, headers) """
+    hashlib, hmac = _hashing()
+    host, key = _s3_parts(url)
+    service = 's3'
+    region = creds['region']
+    request_parameters = _s3_querystring(params) if params else ''
 
     # Create a date for headers and the credential string
-    t = datetime.datetime.utcnow()
     amzdate = t.strftime('%Y%m%dT%H%M%SZ')
     datestamp = t.strftime('%Y%m%d') # Date w/o time, used in credential scope
 
@@ -151,8 +506,8 @@ def get_s3_signed_url(url, rtype='GET', public=False, requester_pays=False, cont
         headers['x-amz-request-payer'] = 'requester'
     if public:
         headers['x-amz-acl'] = 'public-read'
-    if os.environ.get('AWS_SESSION_TOKEN') and 'AWS_BUCKET_ACCESS_KEY_ID' not in os.environ:
-        headers['x-amz-security-token'] = os.environ.get('AWS_SESSION_TOKEN')
+    if creds['token']:
+        headers['x-amz-security-token'] = creds['token']
     canonical_headers = '\n'.join('%s:%s' % (key, headers[key]) for key in sorted(headers)) + '\n'
     signed_headers = ';'.join(sorted(headers.keys()))
 
@@ -162,20 +517,101 @@ def get_s3_signed_url(url, rtype='GET', public=False, requester_pays=False, cont
     algorithm = 'AWS4-HMAC-SHA256'
     credential_scope = datestamp + '/' + region + '/' + service + '/' + 'aws4_request'
     string_to_sign = algorithm + '\n' +  amzdate + '\n' +  credential_scope + '\n' +  hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
-    signing_key = getSignatureKey(secret_key, datestamp, region, service)
+    signing_key = get_signature_key(creds['secret_key'], datestamp, region, service)
     signature = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
-    authorization_header = algorithm + ' ' + 'Credential=' + access_key + '/' + credential_scope + ', ' \
+    authorization_header = algorithm + ' ' + 'Credential=' + creds['access_key'] + '/' + credential_scope + ', ' \
         + 'SignedHeaders=' + signed_headers + ', ' + 'Signature=' + signature
 
     request_url = 'https://%s%s' % (host, canonical_uri)
+    if canonical_querystring:
+        request_url += '?' + canonical_querystring
     headers['Authorization'] = authorization_header
     if content_type is not None:
         headers['content-type'] = content_type
     return request_url, headers
 
 
+def get_s3_signed_url(url, rtype='GET', public=False, requester_pays=False, content_type=None, params=None):
+    creds = s3_credentials()
+    if creds is None:
+        # if credentials not provided, just try to download without signed URL
+        logger.debug('Not using signed URL for %s' % url)
+        return (url + '?' + _s3_querystring(params) if params else url), None
+    with metrics.timer('presign', url):
+        return _sign_s3(url, creds, datetime.datetime.utcnow(), rtype=rtype, public=public,
+                        requester_pays=requester_pays, content_type=content_type, params=params)
+
+
+def get_s3_signed_urls(urls, **kwargs):
+    """ Sign many S3 urls at once, returning list of (url, headers) as get_s3_signed_url """
+    creds = s3_credentials()
+    if creds is None:
+        logger.debug('Not using signed URLs for %s urls' % len(urls))
+        return [(url, None) for url in urls]
+    t = datetime.datetime.utcnow()
+    signed = []
+    for url in urls:
+        with metrics.timer('presign', url):
+            signed.append(_sign_s3(url, creds, t, **kwargs))
+    return signed
+
+
+def get_s3_presigned_url(url, expires=3600, rtype='GET', requester_pays=False, t=None):
+    """ Get S3 URL with the signature in the query string, valid for `expires` seconds
+
+    Such URLs can be used without any headers by external tools (e.g., GDAL, curl). If no
+    credentials are set the url is returned as is.
+    """
+    creds = s3_credentials()
+    if creds is None:
+        logger.debug('Not using presigned URL for %s' % url)
+        return url
+    t = datetime.datetime.utcnow() if t is None else t
+    with metrics.timer('presign', url):
+        return _presign_s3(url, creds, t, expires=expires, rtype=rtype, requester_pays=requester_pays)
+
+
+def _presign_s3(url, creds, t, expires=3600, rtype='GET', requester_pays=False):
+    """ Presign S3 url with credentials at time t, see get_s3_presigned_url """
+    hashlib, hmac = _hashing()
+    host, key = _s3_parts(url)
+    service = 's3'
+    region = creds['region']
+    amzdate = t.strftime('%Y%m%dT%H%M%SZ')
+    datestamp = t.strftime('%Y%m%d')
+    credential_scope = datestamp + '/' + region + '/' + service + '/' + 'aws4_request'
+    params = {
+        'X-Amz-Algorithm': 'AWS4-HMAC-SHA256',
+        'X-Amz-Credential': creds['access_key'] + '/' + credential_scope,
+        'X-Amz-Date': amzdate,
+        'X-Amz-Expires': str(int(expires)),
+        'X-Amz-SignedHeaders': 'host'
+    }
+    if creds['token']:
+        params['X-Amz-Security-Token'] = creds['token']
+    if requester_pays:
+        params['x-amz-request-payer'] = 'requester'
+    canonical_uri = '/' + quote(key, safe='/~')
+    canonical_querystring = _s3_querystring(params)
+    canonical_request = '%s\n%s\n%s\nhost:%s\n\nhost\nUNSIGNED-PAYLOAD' % (
+        rtype, canonical_uri, canonical_querystring, host
+    )
+    string_to_sign = 'AWS4-HMAC-SHA256\n' + amzdate + '\n' + credential_scope + '\n' + \
+        hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+    signing_key = get_signature_key(creds['secret_key'], datestamp, region, service)
+    signature = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+    return 'https://%s%s?%s&X-Amz-Signature=%s' % (host, canonical_uri, canonical_querystring, signature)
+
+
+def get_s3_presigned_urls(urls, **kwargs):
+    """ Presign many S3 urls at once, see get_s3_presigned_url """
+    t = datetime.datetime.utcnow()
+    return [get_s3_presigned_url(url, t=t, **kwargs) for url in urls]
+
+
 def terminal_calendar(events, cols=3):
     """ Get calendar covering all dates, with provided dates colored and labeled """
+    import calendar
     if len(events.keys()) == 0:
         return ''
     # events is {'date': 'label'}
@@ -35,7 +35,7 @@ setup(
     entry_points={
         'console_scripts': ['sat-stac=satstac.cli:cli'],
     },
-    packages=find_packages(exclude=['docs', 'tests*']),
+    packages=find_packages(exclude=['docs', 'tests*', 'benchmarks*']),
     include_package_data=True,
     install_requires=install_requires,
     dependency_links=dependency_links,
@@ -0,0 +1,55 @@
+import os
+import threading
+import unittest
+
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from satstac import Item
+
+testpath = os.path.dirname(__file__)
+
+
+def make_item(id, dt='2020-01-01T00:00:00Z', **props):
+    """ Get a minimal Item with datetime dt and other properties """
+    props['datetime'] = dt
+    return Item({'id': id, 'type': 'Feature', 'properties': props})
+
+
+def landsat_items(n):
+    """ Get n copies of the test Landsat Item, with ids item-0, item-1, ... """
+    items = []
+    for i in range(n):
+        item = Item.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/item.json'))
+        item._data['id'] = 'item-%s' % i
+        items.append(item)
+    return items
+
+
+class Handler(SimpleHTTPRequestHandler):
+    """ Serve the test directory with keep-alive connections, without logging """
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('directory', testpath)
+        super(Handler, self).__init__(*args, **kwargs)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServerTestCase(unittest.TestCase):
+    """ Tests with a local HTTP server (of server_class using handler) at cls.url """
+
+    handler = Handler
+    server_class = ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = cls.server_class(('127.0.0.1', 0), cls.handler)
+        cls.url = 'http://127.0.0.1:%s' % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
@@ -0,0 +1,54 @@
+import json
+import os
+import sys
+import unittest
+
+testpath = os.path.dirname(__file__)
+
+# benchmarks is not installed with sat-stac, import it from the repository
+sys.path.insert(0, os.path.dirname(os.path.abspath(testpath)))
+
+from benchmarks import compare, generate, run
+from satstac import storage, Catalog
+
+
+class Test(unittest.TestCase):
+
+    def test_items(self):
+        items = generate.items(10, seed=1)
+        assert(len(items) == 10)
+        assert(len(set(i.id for i in items)) == 10)
+        # deterministic
+        assert([i._data for i in items] == [i._data for i in generate.items(10, seed=1)])
+        assert([i._data for i in items] != [i._data for i in generate.items(10, seed=2)])
+        assert(items[0]['bench:level1'] in ['c0', 'c1', 'c2'])
+
+    def test_itemcollection(self):
+        items = generate.itemcollection(20)
+        assert(len(items) == 20)
+        assert(items[0].collection().id == 'synthetic')
+        assert(len(items[0].assets_by_common_name) == len(generate.BANDS))
+
+    def test_catalog(self):
+        path = 'memory://test-benchmarks'
+        cat = generate.catalog(path, 20, depth=2, fanout=2)
+        try:
+            cat = Catalog.open(cat.filename)
+            items = list(cat.items())
+            assert(len(items) == 20)
+            assert(items[0].filename.count('/') == path.count('/') + 4)
+        finally:
+            storage.get(path).remove()
+
+    def test_run(self):
+        results = run(nitems=10, repeat=1, scenarios=['thing.open', 'item.get_path'])
+        assert(list(results['results'].keys()) == ['thing.open', 'item.get_path'])
+        r = results['results']['thing.open']
+        assert(r['count'] == 10)
+        assert(r['seconds'] > 0)
+        assert(r['peak_memory'] > 0)
+        # results are JSON
+        results = json.loads(json.dumps(results))
+        assert('thing.open' in compare(results, results))
+        assert(len(storage.get('memory://').list(results['params']['path'])) == 0)
+
@@ -0,0 +1,107 @@
+import os
+import shutil
+
+from satstac import cache, Catalog, Thing
+from satstac.cache import DocumentCache
+
+import helpers
+
+testpath = os.path.dirname(__file__)
+
+
+class Handler(helpers.Handler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get('If-Modified-Since'))
+        return super(Handler, self).do_GET()
+
+
+class Test(helpers.ServerTestCase):
+
+    path = os.path.join(testpath, 'test-cache')
+    handler = Handler
+
+    @classmethod
+    def tearDownClass(cls):
+        super(Test, cls).tearDownClass()
+        if os.path.exists(cls.path):
+            shutil.rmtree(cls.path)
+
+    def setUp(self):
+        cache.documents.invalidate()
+        cache.documents.reset_stats()
+
+    def test_lru(self):
+        docs = DocumentCache(maxsize=2)
+        docs.put('a', 1, b'{"id": "a"}')
+        docs.put('b', 1, b'{"id": "b"}')
+        assert(docs.get('a', 1) == b'{"id": "a"}')
+        docs.put('c', 1, b'{"id": "c"}')
+        assert('a' in docs)
+        assert('b' not in docs)
+        assert(len(docs) == 2)
+        assert(docs.get('a', 2) is None)
+        stats = docs.stats()
+        assert(stats['hits'] == 1)
+        assert(stats['misses'] == 1)
+        docs.invalidate('a')
+        assert('a' not in docs)
+        docs.resize(0)
+        assert(len(docs) == 0)
+        docs.put('a', 1, b'{"id": "a"}')
+        assert(len(docs) == 0)
+
+    def test_copies(self):
+        fname = os.path.join(self.path, 'catalog-copies.json')
+        cat = Catalog.create().save(fname)
+        cat.add_link('child', 'child/catalog.json')
+        # unsaved changes are not cached, and each open gets its own data
+        cat1 = Catalog.open(fname)
+        assert(cat1.links('child') == [])
+        cat1.add_link('child', 'child/catalog.json')
+        assert(Catalog.open(fname).links('child') == [])
+        assert(cache.documents.stats()['hits'] == 2)
+
+    def test_open_local(self):
+        fname = os.path.join(testpath, 'catalog/catalog.json')
+        cat1 = Catalog.open(fname)
+        cat2 = Catalog.open(fname)
+        assert(cat1._data == cat2._data)
+        assert(cat1._data is not cat2._data)
+        stats = cache.documents.stats()
+        assert(stats['misses'] == 1)
+        assert(stats['hits'] == 1)
+
+    def test_open_local_modified(self):
+        fname = os.path.join(self.path, 'catalog.json')
+        cat = Catalog.create().save(fname)
+        assert(cache.documents.stats()['size'] == 1)
+        cat = Catalog.open(fname)
+        assert(cache.documents.stats()['hits'] == 1)
+        # modify the file outside of sat-stac
+        with open(fname, 'w') as f:
+            f.write('{"id": "modified", "links": []}')
+        os.utime(fname, ns=(0, 0))
+        cat = Catalog.open(fname)
+        assert(cat.id == 'modified')
+
+    def test_save_updates_cache(self):
+        fname = os.path.join(self.path, 'catalog-save.json')
+        cat = Catalog.create().save(fname)
+        cat.add_link('child', 'child/catalog.json')
+        cat.save()
+        cat = Catalog.open(fname)
+        assert(cache.documents.stats()['hits'] == 1)
+        assert(len(cat.links('child')) == 1)
+
+    def test_open_remote(self):
+        url = self.url + '/catalog/catalog.json'
+        Handler.requests = []
+        thing1 = Thing.open(url)
+        thing2 = Thing.open(url)
+        assert(thing1.id == thing2.id == 'stac-catalog')
+        # second request is conditional and answered with 304 Not Modified
+        assert(Handler.requests[0] is None)
+        assert(Handler.requests[1] is not None)
+        assert(cache.documents.stats()['hits'] == 1)
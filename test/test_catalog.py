@@ -77,6 +77,21 @@ class Test(unittest.TestCase):
         items = [i for i in self.get_catalog().items()]
         assert(len(items) == 2)
 
+    def test_get_items_threaded(self):
+        serial = [i.id for i in self.get_catalog().items()]
+        items = [i.id for i in self.get_catalog().items(workers=4)]
+        assert(items == serial)
+        items = [i.id for i in self.get_catalog().items(workers=4, ordered=False)]
+        assert(sorted(items) == sorted(serial))
+
+    def test_get_children_threaded(self):
+        cat = Catalog.open(os.path.join(testpath, 'catalog/eo/catalog.json'))
+        serial = [c.id for c in cat.children()]
+        children = [c.id for c in cat.children(workers=2)]
+        assert(children == serial)
+        children = [c.id for c in cat.children(workers=2, ordered=False)]
+        assert(sorted(children) == sorted(serial))
+
     def test_add_catalog(self):
         cat = Catalog.create(root='http://my.cat').save(os.path.join(self.path, 'catalog.json'))
         col = Catalog.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/catalog.json'))
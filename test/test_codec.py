@@ -0,0 +1,55 @@
+import json
+import os
+import unittest
+
+from satstac import cache, codec, Item
+
+testpath = os.path.dirname(__file__)
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = codec.name()
+
+    def tearDown(self):
+        codec.use(self.codec)
+
+    def test_available(self):
+        names = codec.available()
+        # standard library is always available, and the last choice
+        assert(names[-1] == 'json')
+        assert(codec.name() in names)
+
+    def test_use(self):
+        assert(codec.use('json') == 'json')
+        assert(codec.name() == 'json')
+        with self.assertRaises(ValueError):
+            codec.use('nosuchcodec')
+
+    def test_roundtrip(self):
+        data = {'id': 'ümlaut/é', 'bbox': [-1.5, 2, 3e10], 'properties': {'a': None, 'b': True}}
+        for name in codec.available():
+            codec.use(name)
+            encoded = codec.dumps(data)
+            assert(isinstance(encoded, bytes))
+            assert(json.loads(encoded.decode('utf-8')) == data)
+            assert(codec.loads(encoded) == data)
+            assert(codec.loads(encoded.decode('utf-8')) == data)
+
+    def test_open(self):
+        fname = os.path.join(testpath, 'catalog/eo/landsat-8-l1/item.json')
+        for name in codec.available():
+            codec.use(name)
+            cache.documents.invalidate()
+            item = Item.open(fname)
+            assert(item._data == json.loads(open(fname).read()))
+
+    def test_benchmark(self):
+        item = Item.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/item.json'))
+        results = codec.benchmark([item._data] * 10, number=2)
+        assert(list(results.keys()) == codec.available())
+        for r in results.values():
+            assert(r['bytes'] > 0)
+            assert(r['loads_mb_per_second'] > 0)
+        assert('json' in codec.benchmark_summary(results))
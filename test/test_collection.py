@@ -3,8 +3,12 @@ import os
 import unittest
 import shutil
 
+from unittest import mock
+
 from satstac import __version__, STACError, Catalog, Collection, Item
 
+from helpers import landsat_items
+
 
 testpath = os.path.dirname(__file__)
 
@@ -64,4 +68,32 @@ class Test(unittest.TestCase):
         assert(item.collection().id == col.id)
         # test code using existing catalogs
         col.add_item(item, filename_template='${landsat:path}/${landsat:row}/${date}/${id}.json')
-        assert(item.root().id == cat.id)
\ No newline at end of file
+        assert(item.root().id == cat.id)
+
+    def test_add_items(self):
+        cat = Catalog.create(root='http://my.cat').save(os.path.join(self.path, 'test_add_items.json'))
+        col = Collection.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/catalog.json'))
+        cat.add_catalog(col)
+        items = landsat_items(5)
+        stats = col.add_items(items, filename_template='${date}/${id}.json')
+        assert(stats['items'] == 5)
+        assert(stats['parents'] == 1)
+        parent = Catalog.open(items[0].links('parent')[0])
+        assert(len(parent.links('item')) == 5)
+        assert(sorted([i.id for i in parent.items()]) == sorted([i.id for i in items]))
+        assert(items[0].collection().id == col.id)
+
+    def test_parent_catalog_registry(self):
+        cat = Catalog.create(root='http://my.cat').save(os.path.join(self.path, 'test_registry.json'))
+        col = Collection.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/catalog.json'))
+        cat.add_catalog(col)
+        template = '${landsat:path}/${landsat:row}/${date}/${id}.json'
+        item = Item.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/item.json'))
+        fname = col.parent_catalog(item, template)
+        assert(len(col._subcatalogs) == 3)
+        # known sub-catalogs are not opened or checked again
+        with mock.patch.object(Catalog, 'open', side_effect=AssertionError):
+            assert(col.parent_catalog(item, template) == fname)
+        item2 = Item.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/item.json'))
+        assert(col.parent_catalog(item2, template) == fname)
+        assert(col.parent_catalog(item, '${id}.json') == col.filename)
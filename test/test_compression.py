@@ -0,0 +1,94 @@
+import gzip
+import os
+import shutil
+import unittest
+
+from satstac import compression, Catalog, Collection, Item, ItemCollection
+
+testpath = os.path.dirname(__file__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Test(unittest.TestCase):
+
+    path = os.path.join(testpath, 'test-compression')
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Remove test files """
+        if os.path.exists(cls.path):
+            shutil.rmtree(cls.path)
+
+    def test_detect(self):
+        assert(compression.detect('catalog.json') is None)
+        assert(compression.detect('catalog.json.gz') == 'gzip')
+        assert(compression.detect('s3://bucket/items.json.zst') == 'zstd')
+
+    def test_gzip(self):
+        data = b'{"id": "test"}' * 1000
+        compressed = compression.compress(data, 'gzip')
+        assert(len(compressed) < len(data))
+        # deterministic
+        assert(compression.compress(data, 'gzip') == compressed)
+        assert(gzip.decompress(compressed) == data)
+        assert(compression.decompress(compressed, 'gzip') == data)
+        assert(compression.decompress(data, None) == data)
+
+    def test_iter_decompress(self):
+        data = b'{"id": "test"}' * 1000
+        compressed = compression.compress(data, 'gzip')
+        chunks = [compressed[i:i+100] for i in range(0, len(compressed), 100)]
+        assert(b''.join(compression.iter_decompress(chunks, 'gzip')) == data)
+        # concatenated members
+        assert(b''.join(compression.iter_decompress([compressed + compressed], 'gzip')) == data + data)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            compression.compress(b'', 'bz2')
+
+    @unittest.skipIf(zstandard is None, 'zstandard not installed')
+    def test_zstd(self):
+        data = b'{"id": "test"}' * 1000
+        compressed = compression.compress(data, 'zstd')
+        assert(len(compressed) < len(data))
+        assert(compression.decompress(compressed, 'zstd') == data)
+        chunks = [compressed[i:i+10] for i in range(0, len(compressed), 10)]
+        assert(b''.join(compression.iter_decompress(chunks, 'zstd')) == data)
+
+    def test_thing(self):
+        fname = os.path.join(self.path, 'catalog.json.gz')
+        cat = Catalog.create().save(fname)
+        with gzip.open(fname) as f:
+            assert(b'stac-catalog' in f.read())
+        assert(Catalog.open(fname).id == cat.id)
+        # explicit compression
+        fname = os.path.join(self.path, 'catalog-gzip.json')
+        Catalog.create().save(fname, compression='gzip')
+        with open(fname, 'rb') as f:
+            assert(f.read(2) == b'\x1f\x8b')
+        assert(Catalog.open(fname, compression='gzip').id == cat.id)
+
+    def test_items(self):
+        cat = Catalog.create(root='http://my.cat').save(os.path.join(self.path, 'items', 'catalog.json'))
+        col = Collection.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/catalog.json'))
+        cat.add_catalog(col)
+        item = Item.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/item.json'))
+        col.add_item(item, filename_template='${date}/${id}.json.gz')
+        assert(item.filename.endswith('.json.gz'))
+        items = list(Catalog.open(cat.filename).items())
+        assert(len(items) == 1)
+        assert(items[0].id == item.id)
+
+    def test_itemcollection(self):
+        items = ItemCollection.open(os.path.join(testpath, 'items.json'))
+        fname = os.path.join(self.path, 'items.json.gz')
+        items.save(fname)
+        assert(os.path.getsize(fname) < os.path.getsize(os.path.join(testpath, 'items.json')))
+        items2 = ItemCollection.open(fname)
+        assert([i.id for i in items2] == [i.id for i in items])
+        streamed = list(ItemCollection.stream(fname, chunk_size=100))
+        assert([i.id for i in streamed] == [i.id for i in items])
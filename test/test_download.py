@@ -0,0 +1,78 @@
+import os
+import shutil
+
+from satstac import Item, ItemCollection
+from satstac.download import DownloadManager
+
+import helpers
+
+testpath = os.path.dirname(__file__)
+
+
+class Test(helpers.ServerTestCase):
+
+    path = os.path.join(testpath, 'test-download')
+
+    @classmethod
+    def tearDownClass(cls):
+        super(Test, cls).tearDownClass()
+        if os.path.exists(cls.path):
+            shutil.rmtree(cls.path)
+
+    def get_items(self, n=3):
+        items = []
+        for i in range(n):
+            items.append(Item({
+                'id': 'item-%s' % i,
+                'properties': {'datetime': '2020-01-01T00:00:00Z'},
+                'assets': {
+                    'catalog': {'href': self.url + '/catalog/catalog.json'},
+                    'items': {'href': self.url + '/items.json'},
+                    'missing': {'href': self.url + '/nosuchfile.json'}
+                }
+            }))
+        return items
+
+    def test_download_assets(self):
+        progress = []
+        manager = DownloadManager(workers=4, host_connections=2, progress=progress.append)
+        template = os.path.join(self.path, 'manager', '${id}')
+        results = manager.download_assets(self.get_items(), keys=['catalog', 'items', 'missing', 'nokey'],
+                                          filename_template=template)
+        assert(len(results) == 12)
+        assert(len(progress) == 12)
+        assert(progress[-1]['completed'] == 12)
+        assert(progress[-1]['failed'] == 6)
+        for r in results:
+            if r.key in ['catalog', 'items']:
+                assert(r.error is None)
+                assert(os.path.getsize(r.path) == r.bytes)
+                assert(r.seconds >= 0)
+            else:
+                assert(r.error is not None)
+                assert(r.bytes == 0)
+        stats = manager.stats()
+        assert(stats['bytes'] == sum([r.bytes for r in results]))
+
+    def test_item_download_assets(self):
+        item = self.get_items(1)[0]
+        template = os.path.join(self.path, 'item', '${id}')
+        filenames = item.download_assets(keys=['catalog', 'items', 'missing', 'nokey'], workers=2,
+                                         filename_template=template)
+        assert(len(filenames) == 4)
+        assert(os.path.exists(filenames[0]) and os.path.exists(filenames[1]))
+        assert(filenames[2:] == [None, None])
+        # same filenames as downloading one at a time
+        assert(item.download_assets(keys=['catalog', 'items', 'missing', 'nokey'], filename_template=template) == filenames)
+
+    def test_itemcollection_download_assets(self):
+        items = ItemCollection(self.get_items())
+        template = os.path.join(self.path, 'itemcollection', '${id}')
+        filenames = items.download_assets(keys=['catalog', 'missing'], workers=3, filename_template=template)
+        assert(len(filenames) == 3)
+        for fnames in filenames:
+            assert(os.path.exists(fnames[0]))
+            assert(fnames[1] is None)
+        results, filenames = items.download_results(keys=['items'], filename_template=template)
+        assert(len(results) == 3)
+        assert(all([r.error is None for r in results]))
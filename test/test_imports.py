@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+testpath = os.path.dirname(__file__)
+
+# modules that are slow to import and only needed for some operations
+DEFERRED = ['requests', 'urllib3', 'dateutil', 'multiprocessing', 'xml.etree.ElementTree', 'email.utils',
+            'hashlib', 'calendar', 'ssl', 'http.client']
+
+# seconds, for all of `import satstac` and for the satstac modules themselves. Timings vary
+# on shared machines, so the budget is only checked with SATSTAC_TEST_IMPORT_BUDGET=1
+IMPORT_BUDGET = 0.1
+SATSTAC_BUDGET = 0.025
+
+
+def python(code, pycache):
+    """ Run code in a new interpreter, with bytecode cached in pycache (Python 3.8+), returning (stdout, stderr) """
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env,
+                          cwd=os.path.dirname(testpath), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True)
+    return proc.stdout, proc.stderr
+
+
+def import_times(stderr):
+    """ Get {module: (self, cumulative)} seconds from -X importtime output """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        t_self, t_cum, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(t_self) / 1e6, int(t_cum) / 1e6)
+    return times
+
+
+class Test(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pycache = tempfile.TemporaryDirectory()
+        # compile once so timings do not include compiling
+        python('import satstac, satstac.cli', cls.pycache.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pycache.cleanup()
+
+    def test_deferred(self):
+        code = 'import sys, json, satstac, satstac.cli; print(json.dumps(list(sys.modules.keys())))'
+        modules = json.loads(python(code, self.pycache.name)[0])
+        assert([m for m in DEFERRED if m in modules] == [])
+
+    def test_deferred_until_used(self):
+        code = 'import sys, satstac; satstac.utils.parse_datetime("2020-01-01"); print("dateutil" in sys.modules)'
+        assert(python(code, self.pycache.name)[0].strip() == 'True')
+
+    @unittest.skipUnless(os.getenv('SATSTAC_TEST_IMPORT_BUDGET') == '1', 'set SATSTAC_TEST_IMPORT_BUDGET=1 to check import time')
+    def test_import_budget(self):
+        # fastest of a few runs, to allow for a busy machine
+        runs = [import_times(python('import satstac', self.pycache.name)[1]) for i in range(3)]
+        total = min(r['satstac'][1] for r in runs)
+        own = min(sum(t[0] for m, t in r.items() if m.split('.')[0] == 'satstac') for r in runs)
+        assert total < IMPORT_BUDGET, 'import satstac took %.3f seconds' % total
+        assert own < SATSTAC_BUDGET, 'satstac modules took %.3f seconds' % own
@@ -0,0 +1,127 @@
+import datetime
+import os
+import random
+import unittest
+
+from satstac.index import BBoxIndex, PropertyTable, TimeIndex
+
+from helpers import make_item
+
+testpath = os.path.dirname(__file__)
+
+
+class Test(unittest.TestCase):
+
+    def get_items(self):
+        return [
+            make_item('a', platform='landsat-8', cloud_cover=10, bands=[1, 2]),
+            make_item('b', platform='sentinel-2a', cloud_cover=50, bands=[1, 2]),
+            make_item('c', '2020-01-02T10:00:00Z', platform='landsat-8', cloud_cover=10),
+        ]
+
+    def test_column(self):
+        table = PropertyTable(self.get_items())
+        assert(len(table) == 3)
+        assert(table.column('cloud_cover') == [10, 50, 10])
+        assert(table.column('nosuchproperty') == [None, None, None])
+        assert(table.column('date')[2] == datetime.date(2020, 1, 2))
+
+    def test_positions(self):
+        table = PropertyTable(self.get_items())
+        assert(table.positions('platform', ['landsat-8']) == [0, 2])
+        assert(table.positions('platform', ['sentinel-2a', 'landsat-8']) == [1, 0, 2])
+        assert(table.positions('bands', [[1, 2]]) == [0, 1])
+        assert(table.positions('platform', ['nosuchplatform']) == [])
+
+    def test_unique(self):
+        table = PropertyTable(self.get_items())
+        assert(sorted(table.unique('platform')) == ['landsat-8', 'sentinel-2a'])
+        assert(table.unique('platform', [0, 2]) == ['landsat-8'])
+        assert(len(table.unique('date')) == 2)
+
+    def test_subset(self):
+        table = PropertyTable(self.get_items())
+        table.column('cloud_cover')
+        sub = table.subset([2, 0])
+        assert([i.id for i in sub._items] == ['c', 'a'])
+        assert(sub._columns['cloud_cover'] == [10, 10])
+        assert(sub.positions('platform', ['landsat-8']) == [0, 1])
+
+    def random_bboxes(self, n=500):
+        rand = random.Random(0)
+        bboxes = []
+        for i in range(n):
+            x, y = rand.uniform(-180, 170), rand.uniform(-90, 80)
+            bboxes.append([x, y, x + rand.uniform(0, 10), y + rand.uniform(0, 10)])
+        return bboxes
+
+    def test_bbox_index(self):
+        bboxes = self.random_bboxes()
+        index = BBoxIndex(bboxes)
+        assert(index.size > 1)
+        q = [-20, -20, 30, 10]
+        expected = [p for p, b in enumerate(bboxes) if b[0] <= q[2] and b[2] >= q[0] and b[1] <= q[3] and b[3] >= q[1]]
+        assert(index.intersects(q) == expected)
+        expected = [p for p, b in enumerate(bboxes) if b[0] >= q[0] and b[2] <= q[2] and b[1] >= q[1] and b[3] <= q[3]]
+        assert(index.within(q) == expected)
+        assert(index.intersects([500, 500, 600, 600]) == [])
+
+    def test_bbox_index_3d(self):
+        index = BBoxIndex([[0, 0, 0, 1, 1, 10], None, [5, 5, 6, 6]])
+        assert(index.intersects([0.5, 0.5, 2, 2]) == [0])
+        assert(index.within([-1, -1, 10, 10]) == [0, 2])
+
+    def test_bbox_index_antimeridian(self):
+        index = BBoxIndex([[170, 0, -170, 10], [-179, 0, -175, 5], [0, 0, 10, 10], [160, 0, 165, 5]])
+        assert(index.intersects([175, 0, 180, 5]) == [0])
+        assert(index.intersects([-180, 0, -178, 5]) == [0, 1])
+        assert(index.within([-180, -90, 180, 90]) == [0, 1, 2, 3])
+        assert(index.within([150, -90, 180, 90]) == [3])
+        # queries crossing the antimeridian
+        assert(index.intersects([178, 0, -178, 5]) == [0, 1])
+        assert(index.within([165, -10, -170, 20]) == [0, 1])
+        assert(index.subset([0, 2]).intersects([175, 0, 180, 5]) == [0])
+
+    def test_bbox_index_subset(self):
+        bboxes = self.random_bboxes()
+        index = BBoxIndex(bboxes)
+        positions = list(range(0, len(bboxes), 3))
+        sub = index.subset(positions)
+        q = [-50, -50, 50, 50]
+        expected = BBoxIndex([bboxes[p] for p in positions]).intersects(q)
+        assert(sub.intersects(q) == expected)
+
+    def test_table_bbox_index(self):
+        items = self.get_items()
+        for i, item in enumerate(items):
+            item._data['bbox'] = [i, i, i + 1, i + 1]
+        table = PropertyTable(items)
+        assert(table.bbox_index().intersects([0.5, 0.5, 1.5, 1.5]) == [0, 1])
+        sub = table.subset([2, 1])
+        assert(sub._bbox_index is not None)
+        assert(sub.bbox_index().intersects([0.5, 0.5, 1.5, 1.5]) == [1])
+
+    def test_time_index(self):
+        dts = [datetime.datetime(2020, 1, d, 12, tzinfo=datetime.timezone.utc) for d in [5, 1, 3, 3, 9]]
+        index = TimeIndex(dts)
+        assert(index.between('2020-01-02', '2020-01-05T12:00:00Z') == [0, 2, 3])
+        assert(index.between(end=datetime.date(2020, 1, 2)) == [1])
+        assert(index.between() == [0, 1, 2, 3, 4])
+        assert(index.nearest('2020-01-08') == 4)
+        assert(index.nearest('2019-01-01') == 1)
+        assert(index.nearest(datetime.datetime(2020, 1, 4, 13)) == 0)
+        assert(index.day(datetime.date(2020, 1, 3)) == [2, 3])
+        assert(index.day(datetime.date(2020, 1, 4)) == [])
+        assert(index.dates() == [datetime.date(2020, 1, d) for d in [1, 3, 5, 9]])
+        sub = index.subset([4, 3, 0])
+        assert(sub.between('2020-01-03', '2020-01-06') == [1, 2])
+        assert(sub.day(datetime.date(2020, 1, 3)) == [1])
+        assert(sub.dates() == [datetime.date(2020, 1, d) for d in [3, 5, 9]])
+        assert(TimeIndex([]).nearest('2020-01-01') is None)
+
+    def test_time_index_local_date(self):
+        tz = datetime.timezone(datetime.timedelta(hours=-5))
+        index = TimeIndex([datetime.datetime(2020, 1, 1, 22, tzinfo=tz), datetime.datetime(2020, 1, 2, 1)])
+        # dates are in the timezone of each datetime, as Item.date
+        assert(index.day(datetime.date(2020, 1, 1)) == [0])
+        assert(index.between('2020-01-02T00:00:00Z', '2020-01-02T03:00:00Z') == [0, 1])
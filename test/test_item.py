@@ -2,6 +2,7 @@ import datetime
 import json
 import os
 import shutil
+import tracemalloc
 import unittest
 
 from satstac import Item
@@ -41,6 +42,48 @@ class Test(unittest.TestCase):
         assert(len(item.bbox) == 4)
         #assert(list(item.keys()) == ['id', 'collection', 'datetime', 'eo:platform'])
 
+    def test_datetime_cached(self):
+        item = Item.open(self.filename)
+        dt = item.datetime
+        assert(item.datetime is dt)
+        item._data['properties']['datetime'] = '2020-01-01T00:00:00Z'
+        assert(item.datetime.year == 2020)
+        assert(str(item.date) == '2020-01-01')
+
+    def test_slots(self):
+        item = Item.open(self.filename)
+        assert(not hasattr(item, '__dict__'))
+        with self.assertRaises(AttributeError):
+            item.extra = True
+        # subclasses without __slots__ can still set attributes
+        class DictItem(Item):
+            pass
+        item = DictItem(item._data)
+        item.extra = True
+        assert(item.extra)
+
+    def test_slots_memory(self):
+        with open(self.filename) as f:
+            data = json.loads(f.read())
+
+        class DictItem(object):
+            """ Attributes of an Item as stored before __slots__ """
+            def __init__(self, data):
+                self.filename = None
+                self._data = data
+                self._link_index = None
+                self._assets_by_common_name = None
+                self._collection = None
+                self._datetime = None
+
+        def size(cls, n=1000):
+            tracemalloc.start()
+            items = [cls(data) for i in range(n)]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size / len(items)
+        assert(size(Item) < size(DictItem))
+
     def test_open_with_collection(self):
         item = Item.open(self.filename)
         assert(item.collection().id == 'landsat-8-l1')
@@ -1,7 +1,8 @@
 import os
 import unittest
 
-from satstac import ItemCollection, Item
+from satstac import ItemCollection, Item, STACError
+from satstac.itemcollection import ndjson_ranges
 from shutil import rmtree
 
 testpath = os.path.dirname(__file__)
@@ -36,6 +37,70 @@ class Test(unittest.TestCase):
         os.remove(fname)
         assert(not os.path.exists(fname))
 
+    def test_stream(self):
+        """ Iterate through items in a file """
+        items = list(ItemCollection.stream(os.path.join(testpath, 'items.json'), chunk_size=100))
+        assert(len(items) == 2)
+        assert(isinstance(items[0], Item))
+        assert(items[0].id == self.load_items()[0].id)
+        # collections are after features in this file
+        assert(items[0]._collection.id == 'landsat-8-l1')
+        assert(items[0]['eo:platform'] == self.load_items()[0]['eo:platform'] == 'landsat-8')
+
+    def test_stream_saved(self):
+        """ Stream items from a saved file, linking them to collections """
+        fname = os.path.join(testpath, 'stream-test.json')
+        self.load_items().save(fname)
+        items = list(ItemCollection.stream(fname))
+        os.remove(fname)
+        assert(len(items) == 2)
+        assert(items[0]._collection.id == 'landsat-8-l1')
+        assert(items[0]['eo:platform'] == 'landsat-8')
+
+    def test_stream_missing(self):
+        with self.assertRaises(STACError):
+            list(ItemCollection.stream('nosuchfile.json'))
+
+    def test_save_ndjson(self):
+        """ Save and load items as newline-delimited JSON """
+        items = self.load_items()
+        fname = os.path.join(testpath, 'save-test.ndjson')
+        items.save_ndjson(fname)
+        with open(fname) as f:
+            assert(len(f.readlines()) == 3)
+        items2 = ItemCollection.open_ndjson(fname)
+        assert(len(items2) == 2)
+        assert(len(items2._collections) == 1)
+        assert(items2[0]._collection.id == 'landsat-8-l1')
+        # append items
+        items.save_ndjson(fname, append=True)
+        items2 = ItemCollection.open_ndjson(fname)
+        assert(len(items2) == 4)
+        assert(len(items2._collections) == 1)
+        streamed = list(ItemCollection.stream_ndjson(fname))
+        assert([i.id for i in streamed] == [i.id for i in items2])
+        assert(streamed[0]['eo:platform'] == 'landsat-8')
+        os.remove(fname)
+
+    def test_ndjson_ranges(self):
+        """ Read newline-delimited JSON in byte ranges """
+        items = self.load_items()
+        fname = os.path.join(testpath, 'ranges-test.ndjson')
+        for n in range(5):
+            items.save_ndjson(fname, append=n > 0)
+        ids = [i.id for i in ItemCollection.stream_ndjson(fname)]
+        assert(len(ids) == 10)
+        for nchunks in [1, 2, 3, 7, 50]:
+            ranges = ndjson_ranges(fname, nchunks)
+            _ids = []
+            for start, end in ranges:
+                _ids += [i.id for i in ItemCollection.stream_ndjson(fname, start, end)]
+            assert(_ids == ids)
+        items2 = ItemCollection.open_ndjson(fname, workers=3)
+        assert([i.id for i in items2] == ids)
+        assert(items2[-1]._collection.id == 'landsat-8-l1')
+        os.remove(fname)
+
     def test_collection(self):
         """ Get a collection """
         items = self.load_items()
@@ -66,6 +131,13 @@ class Test(unittest.TestCase):
         dates = items.dates()
         assert(len(dates) == 1)
 
+    def test_datetimes(self):
+        """ Get datetimes of all items """
+        items = self.load_items()
+        dts = items.datetimes()
+        assert(len(dts) == 2)
+        assert(dts[0] is items[0].datetime)
+
     def test_text_calendar(self):
         """ Get calendar """
         items = self.load_items()
@@ -87,6 +159,35 @@ class Test(unittest.TestCase):
         items.filter('eo:cloud_cover', [100])
         assert(len(items) == 1)
 
+    def test_select(self):
+        items = self.load_items()
+        positions = items.table().positions('eo:cloud_cover', [100])
+        assert(len(positions) == 1)
+        items2 = items.select(positions)
+        assert(len(items2) == 1)
+        assert(len(items) == 2)
+        assert(items2[0]['eo:cloud_cover'] == 100)
+        assert(items2.properties('eo:platform') == ['landsat-8'])
+
+    def test_intersects(self):
+        items = self.load_items()
+        bbox = items[0].bbox
+        assert(len(items.intersects(bbox)) >= 1)
+        assert(items[0].id in [i.id for i in items.within(bbox)])
+        assert(len(items.intersects([-100, -10, -90, 0])) == 0)
+        # filtering keeps the spatial index
+        items.filter('eo:cloud_cover', [items[0]['eo:cloud_cover']])
+        assert(items.table()._bbox_index is not None)
+        assert(items.intersects(bbox)[0].id == items[0].id)
+
+    def test_between(self):
+        items = self.load_items()
+        dts = sorted(items.datetimes())
+        assert(len(items.between(dts[0], dts[-1])) == 2)
+        assert(len(items.between(dts[-1])) == 1)
+        assert(len(items.between(end='2000-01-01')) == 0)
+        assert(items.nearest('2000-01-01').datetime == dts[0])
+
     def test_download_assets(self):
         """ Download multiple assets from all items """
         items = self.load_items()
@@ -0,0 +1,70 @@
+import unittest
+
+from satstac import ItemCollection
+from satstac.index import PropertyTable
+from satstac.query import Query
+
+from helpers import make_item
+
+
+class Test(unittest.TestCase):
+
+    def get_items(self):
+        return ItemCollection([
+            make_item('a', '2020-01-01T10:00:00Z', platform='landsat-8', cloud_cover=10),
+            make_item('b', '2020-01-02T10:00:00Z', platform='sentinel-2a', cloud_cover=50),
+            make_item('c', '2020-01-03T10:00:00Z', platform='landsat-8', cloud_cover=30, gsd=30),
+            make_item('d', '2020-01-04T10:00:00Z', platform='sentinel-2b', cloud_cover=5),
+        ])
+
+    def ids(self, items):
+        return [i.id for i in items]
+
+    def test_eq(self):
+        items = self.get_items()
+        assert(self.ids(items.query({'platform': 'landsat-8'})) == ['a', 'c'])
+        assert(self.ids(items.query({'platform': {'eq': 'sentinel-2a'}})) == ['b'])
+        # query does not change the original
+        assert(len(items) == 4)
+
+    def test_in(self):
+        items = self.get_items()
+        assert(self.ids(items.query({'platform': {'in': ['sentinel-2b', 'landsat-8']}})) == ['a', 'c', 'd'])
+
+    def test_range(self):
+        items = self.get_items()
+        assert(self.ids(items.query({'cloud_cover': {'lte': 10}})) == ['a', 'd'])
+        assert(self.ids(items.query({'cloud_cover': {'gt': 10, 'lt': 50}})) == ['c'])
+        assert(self.ids(items.query({'platform': 'landsat-8', 'cloud_cover': {'gte': 20}})) == ['c'])
+        assert(self.ids(items.query({'platform': {'neq': 'landsat-8'}})) == ['b', 'd'])
+
+    def test_datetime_range(self):
+        items = self.get_items()
+        q = {'datetime': {'gte': '2020-01-02T00:00:00Z', 'lt': '2020-01-04T10:00:00Z'}}
+        assert(self.ids(items.query(q)) == ['b', 'c'])
+        assert(self.ids(items.query({'datetime': {'gt': '2020-01-03T10:00:00Z'}})) == ['d'])
+
+    def test_exists(self):
+        items = self.get_items()
+        assert(self.ids(items.query({'gsd': {'exists': True}})) == ['c'])
+        assert(self.ids(items.query({'gsd': {'exists': False}})) == ['a', 'b', 'd'])
+
+    def test_ids(self):
+        items = self.get_items()
+        assert(self.ids(items.query(ids=['d', 'a', 'x'])) == ['a', 'd'])
+        assert(self.ids(items.query({'platform': 'landsat-8'}, ids=['c', 'd'])) == ['c'])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Query({'cloud_cover': {'like': 10}})
+
+    def test_stats(self):
+        items = self.get_items()
+        q = Query({'platform': 'landsat-8', 'cloud_cover': {'lt': 20}, 'gsd': {'exists': False}})
+        assert(self.ids(items.query(q)) == ['a'])
+        assert(len(q.stats) == 3)
+        assert(q.stats[0] == {'predicate': 'platform eq landsat-8', 'candidates': 4, 'eliminated': 2})
+        assert(q.stats[1]['eliminated'] == 1)
+        assert(q.stats[2]['candidates'] == 1)
+        assert('Eliminated' in q.summary())
+        assert(Query().positions(PropertyTable(list(items))) == [0, 1, 2, 3])
@@ -0,0 +1,52 @@
+from http.server import ThreadingHTTPServer
+
+from satstac import session, Thing
+
+import helpers
+
+
+class Server(ThreadingHTTPServer):
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        return super(Server, self).process_request(request, client_address)
+
+
+class Test(helpers.ServerTestCase):
+
+    server_class = Server
+
+    @classmethod
+    def tearDownClass(cls):
+        super(Test, cls).tearDownClass()
+        session.reset()
+
+    def test_get_session(self):
+        assert(session.get_session() is session.get_session())
+
+    def test_configure(self):
+        s1 = session.get_session()
+        config = session.configure(pool_maxsize=20, hosts={'example.com': 50}, timeout=5)
+        assert(config['pool_maxsize'] == 20)
+        assert(config['hosts'] == {'example.com': 50})
+        s2 = session.get_session()
+        assert(s1 is not s2)
+        adapter = s2.get_adapter('https://example.com/catalog.json')
+        assert(adapter._pool_maxsize == 50)
+        adapter = s2.get_adapter('https://other.com/catalog.json')
+        assert(adapter._pool_maxsize == 20)
+        session.reset()
+        assert(session.get_session().get_adapter('https://example.com/')._pool_maxsize == 10)
+
+    def test_configure_invalid(self):
+        with self.assertRaises(ValueError):
+            session.configure(nosuchsetting=1)
+
+    def test_connection_reuse(self):
+        session.reset()
+        connections = self.server.connections
+        for i in range(5):
+            dat = Thing.open_remote(self.url + '/catalog/catalog.json')
+            assert(dat['id'] == 'stac-catalog')
+        assert(self.server.connections - connections == 1)
@@ -0,0 +1,105 @@
+import os
+import shutil
+import unittest
+
+from satstac import storage, Catalog, Collection, Item, ItemCollection
+from satstac.storage import LocalStorage, MemoryStorage
+
+testpath = os.path.dirname(__file__)
+
+
+class Test(unittest.TestCase):
+
+    path = os.path.join(testpath, 'test-storage')
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Remove test files """
+        if os.path.exists(cls.path):
+            shutil.rmtree(cls.path)
+
+    def setUp(self):
+        storage.get('memory://').remove()
+
+    def test_scheme(self):
+        assert(storage.scheme('catalog/catalog.json') == '')
+        assert(storage.scheme('file:///tmp/catalog.json') == 'file')
+        assert(storage.scheme('http://localhost/catalog.json') == 'http')
+        assert(storage.scheme('https://bucket.s3.amazonaws.com/catalog.json') == 's3')
+        assert(storage.scheme('s3://bucket/catalog.json') == 's3')
+        assert(storage.scheme('memory://cat/catalog.json') == 'memory')
+        assert(isinstance(storage.get('memory://cat/catalog.json'), MemoryStorage))
+        with self.assertRaises(ValueError):
+            storage.get('ftp://host/catalog.json')
+
+    def test_resolve(self):
+        assert(storage.resolve('memory://cat/sub/catalog.json', '../item.json') == 'memory://cat/item.json')
+        assert(storage.resolve('https://host/cat/catalog.json', 'sub/catalog.json') == 'https://host/cat/sub/catalog.json')
+        assert(storage.resolve('s3://bucket/catalog.json', 'https://host/item.json') == 'https://host/item.json')
+        fname = os.path.join(testpath, 'catalog.json')
+        assert(storage.resolve(fname, 'sub/catalog.json') == os.path.join(testpath, 'sub/catalog.json'))
+
+    def test_memory(self):
+        store = MemoryStorage()
+        url = 'memory://test/a.json'
+        assert(not store.exists(url))
+        with self.assertRaises(FileNotFoundError):
+            store.read(url)
+        v1 = store.write(url, b'{}')
+        store.write('memory://test/sub/b.json', b'[]')
+        assert(store.exists(url))
+        assert(store.read(url) == b'{}')
+        assert(store.stat(url)['size'] == 2)
+        assert(store.fetch(url, validator=v1) == (None, v1))
+        v2 = store.write(url, b'{"a": 1}')
+        assert(store.fetch(url, validator=v1) == (b'{"a": 1}', v2))
+        assert(store.list('memory://test/') == ['memory://test/a.json', 'memory://test/sub/b.json'])
+        assert(list(store.iter_chunks(url, chunk_size=3)) == [b'{"a', b'": ', b'1}'])
+
+    def test_local(self):
+        store = LocalStorage()
+        fname = os.path.join(self.path, 'local', 'sub', 'a.json')
+        store.write(fname, b'{}')
+        assert(store.exists(fname))
+        assert(store.read('file://' + fname) == b'{}')
+        assert(store.stat(fname)['size'] == 2)
+        assert(store.list(os.path.join(self.path, 'local')) == [fname])
+        with self.assertRaises(FileNotFoundError):
+            store.stat(fname + '.missing')
+
+    def test_memory_catalog(self):
+        cat = Catalog.create(root='memory://cat').save('memory://cat/catalog.json')
+        col = Collection.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/catalog.json'))
+        cat.add_catalog(col)
+        item = Item.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/item.json'))
+        col.add_item(item, filename_template='${date}/${id}')
+        files = storage.get('memory://').list('memory://cat/')
+        assert(len(files) == 4)
+        assert(item.filename in files)
+        # reopen from memory
+        cat = Catalog.open('memory://cat/catalog.json')
+        items = list(cat.items())
+        assert(len(items) == 1)
+        assert(items[0].id == item.id)
+        assert(items[0].parent().filename == 'memory://cat/landsat-8-l1/2020-06-11/catalog.json')
+        assert(not os.path.exists(os.path.join(os.getcwd(), 'memory:')))
+
+    def test_memory_itemcollection(self):
+        items = ItemCollection.open(os.path.join(testpath, 'items.json'))
+        items.save('memory://items.json')
+        items2 = ItemCollection.open('memory://items.json')
+        assert(len(items2) == len(items))
+        assert([i.id for i in ItemCollection.stream('memory://items.json', chunk_size=1000)] == [i.id for i in items])
+
+    def test_s3_stand_in(self):
+        root = os.path.join(self.path, 's3')
+        previous = storage.register('s3', LocalStorage(root=root))
+        try:
+            Catalog.create().save('s3://bucket/catalog.json')
+            assert(os.path.exists(os.path.join(root, 'bucket', 'catalog.json')))
+            cat = Catalog.open('s3://bucket/catalog.json')
+            assert(cat.id == 'stac-catalog')
+            assert(storage.get('s3://bucket/').list('s3://bucket/') == ['s3://bucket/catalog.json'])
+        finally:
+            storage.register('s3', previous)
+        assert(storage.get('s3://bucket/catalog.json') is previous)
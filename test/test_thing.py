@@ -3,6 +3,7 @@ import os
 import shutil
 import unittest
 from satstac import Thing, STACError
+from satstac.thing import LINK_INDEX_SIZE
 
 
 testpath = os.path.dirname(__file__)
@@ -88,6 +89,43 @@ class Test(unittest.TestCase):
         assert(len(thing.links('testlink')) == 1)
         assert(thing.links('testlink')[0] == 'bobloblaw')
 
+    def test_add_many_links(self):
+        thing = Thing({'id': 'many'})
+        for i in range(1000):
+            thing.add_link('item', 'item-%s.json' % i)
+            thing.add_link('item', 'item-%s.json' % i)
+        thing.add_link('child', 'child.json')
+        assert(len(thing._data['links']) == 1001)
+        assert(len(thing.links('item')) == 1000)
+        assert(thing.links('child') == ['child.json'])
+        # links are resolved relative to filename when it is set or changed
+        thing.filename = '/stac/catalog.json'
+        assert(thing.links('child') == ['/stac/child.json'])
+        thing.filename = '/other/catalog.json'
+        assert(thing.links('child') == ['/other/child.json'])
+        # replacing links directly is picked up
+        thing._data['links'] = [{'rel': 'child', 'href': 'new.json'}]
+        assert(thing.links('child') == ['/other/new.json'])
+        assert(thing.links('item') == [])
+        thing._data['links'].append({'rel': 'item', 'href': 'item.json'})
+        assert(thing.links('item') == ['/other/item.json'])
+        assert(json.dumps(thing._data) == json.dumps({'id': 'many', 'links': [
+            {'rel': 'child', 'href': 'new.json'}, {'rel': 'item', 'href': 'item.json'}]}))
+
+    def test_link_index_size(self):
+        thing = Thing({'id': 'few'})
+        for i in range(LINK_INDEX_SIZE - 1):
+            thing.add_link('item', 'item-%s.json' % i)
+            thing.add_link('item', 'item-%s.json' % i)
+        assert(len(thing.links('item')) == LINK_INDEX_SIZE - 1)
+        # small documents are scanned rather than indexed
+        assert(thing._link_index is None)
+        thing.add_link('child', 'child.json')
+        assert(thing.links('child') == ['child.json'])
+        assert(thing._link_index is not None)
+        thing.add_link('child', 'child.json')
+        assert(len(thing.links()) == LINK_INDEX_SIZE)
+
     def test_get_root(self):
         thing = self.get_thing()
         root = thing.root()
@@ -123,10 +161,12 @@ class Test(unittest.TestCase):
     
     def test_save(self):
         thing = Thing.open(self.fname)
-        thing.save()
+        # save a copy, leaving the test catalog unchanged
         fout = os.path.join(self.path, 'test-save.json')
         thing.save(fout)
         assert(os.path.exists(fout))
+        thing.save()
+        assert(Thing.open(fout).id == thing.id)
 
     #def test_save_remote_with_signed_url(self):
     #    thing = Thing.open(self.fname)
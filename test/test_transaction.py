@@ -0,0 +1,82 @@
+import os
+import shutil
+import unittest
+
+from satstac import Catalog, Collection, transaction
+from satstac.transaction import Transaction
+
+from helpers import landsat_items
+
+testpath = os.path.dirname(__file__)
+
+
+class Test(unittest.TestCase):
+
+    path = os.path.join(testpath, 'test-transaction')
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Remove test files """
+        if os.path.exists(cls.path):
+            shutil.rmtree(cls.path)
+
+    def test_commit(self):
+        fname = os.path.join(self.path, 'commit', 'catalog.json')
+        with Transaction() as tx:
+            assert(transaction.active() is tx)
+            cat = Catalog.create().save(fname)
+            assert(not os.path.exists(fname))
+            assert(len(tx) == 1)
+            # dirty files are opened from memory
+            assert(Catalog.open(fname) is cat)
+            cat.add_catalog(Catalog.create(id='subcat'))
+            assert(len(tx) == 2)
+        assert(transaction.active() is None)
+        cat = Catalog.open(fname)
+        assert([c.id for c in cat.children()] == ['subcat'])
+
+    def test_rollback(self):
+        fname = os.path.join(self.path, 'rollback', 'catalog.json')
+        with self.assertRaises(ValueError):
+            with Transaction():
+                Catalog.create().save(fname)
+                raise ValueError('failed')
+        assert(not os.path.exists(fname))
+
+    def test_add_items(self):
+        fname = os.path.join(self.path, 'items', 'catalog.json')
+        with Transaction(workers=2) as tx:
+            cat = Catalog.create(root='http://my.cat').save(fname)
+            col = Collection.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/catalog.json'))
+            cat.add_catalog(col)
+            for item in landsat_items(3):
+                col.add_item(item, filename_template='${date}/${id}.json')
+            # root, collection, date sub-catalog and 3 items
+            assert(len(tx) == 6)
+            assert(not os.path.exists(fname))
+        col = Collection.open(os.path.join(self.path, 'items', 'landsat-8-l1', 'catalog.json'))
+        items = list(col.items())
+        assert(sorted([i.id for i in items]) == ['item-0', 'item-1', 'item-2'])
+
+    def test_atomic_save(self):
+        fname = os.path.join(self.path, 'atomic', 'catalog.json')
+        Catalog.create().save(fname)
+        Catalog.create(id='updated').save(fname)
+        assert(os.listdir(os.path.dirname(fname)) == ['catalog.json'])
+        assert(Catalog.open(fname).id == 'updated')
+
+    def test_workers(self):
+        fname = os.path.join(self.path, 'workers', 'catalog.json')
+        with Transaction():
+            cat = Catalog.create().save(fname)
+            col = Collection.open(os.path.join(testpath, 'catalog/eo/landsat-8-l1/catalog.json'))
+            cat.add_catalog(col)
+            for item in landsat_items(3):
+                col.add_item(item, filename_template='${date}/${id}.json')
+            # unsaved files are visible to worker threads
+            cat = Catalog.open(fname)
+            assert([c.id for c in cat.children(workers=2)] == ['landsat-8-l1'])
+            assert([i.id for i in cat.items(workers=2)] == [i.id for i in cat.items()])
+            assert(len(list(cat.items(workers=2, ordered=False))) == 3)
+            assert(not os.path.exists(fname))
+        assert(len(list(Catalog.open(fname).items(workers=2))) == 3)